@@ -2,36 +2,77 @@
 from __future__ import annotations
 from collections.abc import (Container, Iterator, Iterable, Sized)
 from typing import (Any, Union, Tuple, )
-from itertools import (filterfalse, )
+import numpy as np
+import pandas as pd
 MINPAD = 1e-13
+# Types won't be flattened
+ATOMS = (str, bytes, bytearray)
+# Types will be yielded as a whole in `iter_flatten`
+BLOCKS = (np.ndarray, pd.Series, pd.Index)
 
 # %%
-def flatten_iterable(iter_:Iterable) -> Iterable:
+def iter_flatten(
+    iter_:Iterable,
+    max_depth:Union[int, None]=None,
+    atoms:tuple=ATOMS,
+    blocks:tuple=BLOCKS
+) -> Iterator:
     """
     Description:
-    Flatten iterable recursively
+    Flatten iterable lazily with a stack of iterators instead of recursion.
+    1. Strings and bytes, A.K.A. `atoms`, won't be flattened
+    2. Arrays and series, A.K.A. `blocks`, will be yielded as a whole
+    3. Iterables deeper than `max_depth` will be yielded as a whole
 
-    WARNING: NO SELF-REFERRENCE ALLOWED
+    WARNING: NO SELF-REFERRENCE ALLOWED UNLESS `max_depth` IS SET
 
     Params:
     iter_: iterable to be flatten
-    flat: iterable to store elements
+    max_depth: levels to be flattened, and 0 means no flattening at all
+    atoms: types not to be flattened
+    blocks: types to be yielded as a whole
 
     Return:
-    flat
+    iterator of elements and blocks
     """
-    flat = []
-    for ele in iter_:
-        if not issubclass(type(ele), Iterable):
-            flat.append(ele)
+    # Top level block won't be iterated either
+    if isinstance(iter_, blocks):
+        yield iter_
+        return
+    stack = [iter(iter_)]
+    while stack:
+        for ele in stack[-1]:
+            if isinstance(ele, atoms) or isinstance(ele, blocks) \
+                    or not issubclass(type(ele), Iterable) \
+                    or (max_depth is not None and len(stack) > max_depth):
+                yield ele
+            else:
+                stack.append(iter(ele))
+                break
         else:
-            flat.extend(flatten_iterable(ele))
-    return flat
+            stack.pop()
+
+def flatten_iterable(
+    iter_:Iterable,
+    max_depth:Union[int, None]=None
+) -> list:
+    """
+    Description:
+    Flatten iterable into list, arrays and series included.
+
+    Params:
+    iter_: iterable to be flatten
+    max_depth: levels to be flattened
+
+    Return:
+    flat
+    """
+    return list(iter_flatten(iter_, max_depth, blocks=()))
 
 def separate_container(iter_: Iterable) -> tuple:
     """
     Description:
-    Seperate containers and no-containers in `iter_`
+    Seperate containers and no-containers in `iter_` in one pass
 
     Params:
     iter_
@@ -39,9 +80,61 @@ def separate_container(iter_: Iterable) -> tuple:
     Return:
     containers, no-containers
     """
-    containers = list(filter(lambda ele: issubclass(type(ele), Container), iter_))
-    no_containers = list(filterfalse(lambda ele: issubclass(type(ele), Container), iter_))
+    containers, no_containers = [], []
+    for ele in iter_:
+        if issubclass(type(ele), Container) and not isinstance(ele, ATOMS):
+            containers.append(ele)
+        else:
+            no_containers.append(ele)
     return containers, no_containers
 
+def partition_container(iter_:Iterable) -> Tuple[list, np.ndarray]:
+    """
+    Description:
+    Partition elements and blocks yielded by `iter_flatten` into containers
+    and scalars in one pass.
+    1. Blocks with numeric dtype are concatenated directly without being
+       boxed into python objects
+    2. Blocks with object dtype are partitioned element by element
+    3. Strings and bytes are regarded as scalars
+
+    Params:
+    iter_: iterable of elements and blocks, usually from `iter_flatten`
+
+    Return:
+    [containers, ], ndarray of scalars
+    """
+    containers, scalars, chunks = [], [], []
+    for ele in iter_:
+        if isinstance(ele, BLOCKS):
+            arr = np.asarray(ele).ravel()
+            if arr.dtype != object:
+                chunks.append(arr)
+                continue
+            for inner in arr:
+                if issubclass(type(inner), Container) \
+                        and not isinstance(inner, ATOMS):
+                    containers.append(inner)
+                else:
+                    scalars.append(inner)
+        elif issubclass(type(ele), Container) and not isinstance(ele, ATOMS):
+            containers.append(ele)
+        else:
+            scalars.append(ele)
+
+    # Keep python scalars as objects, so that ints won't be cast into
+    # floats with numeric blocks
+    if scalars:
+        arr = np.empty(len(scalars), dtype=object)
+        arr[:] = scalars
+        chunks.append(arr)
+    if not chunks:
+        return containers, np.empty(0)
+    elif len(chunks) == 1:
+        return containers, chunks[0]
+    elif any(chunk.dtype == object for chunk in chunks):
+        return containers, np.concatenate([chunk.astype(object) for chunk in chunks])
+    return containers, np.concatenate(chunks)
+
 
 # %%
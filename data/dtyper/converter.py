@@ -7,38 +7,102 @@
 #   Description:
 #----------------------------------------------------------
 #%%
+from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import pandas as pd 
 import numpy as np
 import logging
 logger = logging.getLogger("xutils.converter")
-import .dtool
-import .calculator
-import .dtype
+from . import dtyper
+from ..pdtools import dtool
+from ..stats import calculator
 
 #%%
-def convert_series_dtype(dt):
+def convert_uniques(dt: pd.Series, func: Any) -> pd.Series:
+    """
+    Description:
+    Apply `func` on unique values of `dt` only, and take converted values
+    back by codes from `pd.factorize`, so that the cost scales with the
+    cardinality instead of the number of rows.
+
+    Params:
+    dt: series
+    func: converter for each valid element
+
+    Return:
+    series with object dtype, in which `NaN` is kept
+    """
+    codes, uniques = pd.factorize(dt)
+    converted = np.empty(len(uniques) + 1, dtype=object)
+    for idx, ele in enumerate(uniques):
+        converted[idx] = func(ele)
+    # Code -1 for `NaN`
+    converted[-1] = np.nan
+    return pd.Series(converted[codes], index=dt.index, name=dt.name)
+
+#%%
+# Types inferred by `dtyper.sample_series_type` and their classes
+SAMPLE_TYPE_CLASSES = {
+    "int": int,
+    "float": float,
+    "datetime64": pd.Timestamp,
+    "interval": pd.Interval,
+    "frozenset": frozenset,
+}
+
+def convert_series_dtype(dt, *, sample=False, threshold=0.99, schema=None):
     """
     Description:
     Convert series' dtype automatically according to dt's 
-    first elements
+    first elements, or a stratified random sample of `dt` if `sample` is
+    set.
+
+    In sample mode, the series will be converted with
+    `dtyper.convert_series_type` only if the conformance rate estimated
+    from the sample reaches `threshold`, so no pass over the whole series
+    will be wasted on failed conversion.
 
     Params:
     dt: series
+    sample: if to infer dtype with sample
+    threshold: conformance rate required in sample mode
+    schema: hashable to tell apart columns with the same name in
+        different tables, for formats of datetimes cached
 
     Return:
     dt: series with proper dtype
     dtype: str, class or "other"(when no proper dtype found)
     """
+    if sample and dt.dtype.kind == "O":
+        type_, rate = dtyper.sample_series_type(dt, threshold)
+        if type_ in SAMPLE_TYPE_CLASSES and rate >= threshold:
+            dt = dtyper.convert_series_type(dt, type_, schema=schema)
+            logger.info("`%s` is converted to %s with estimated conformance "
+                    "rate %.4f", dt.name, type_, rate)
+            return dt, SAMPLE_TYPE_CLASSES[type_]
+        logger.info("`%s` isn't converted for estimated conformance rate "
+                "%.4f of %s", dt.name, rate, type_)
+        return dt, str
+
     _first = dt[dt.first_valid_index()]
 
     # dtype == str: try to find proper dtype
     if isinstance(_first, str):
-        _first_converted = utils.convert_type(_first)
+        _first_converted = dtyper.convert_type_cached(_first)
         # convert data type sucessfully
         # try to convert the whole series
         if not isinstance(_first_converted, str):
             try:
-                dt = dt.astype(utils.pdtyper(_first_converted))
+                # Datetimes are parsed with format sniffed and cached, but
+                # series with any value not parsed is kept as `astype`
+                if dtyper.pdtyper(_first_converted) == "datetime64":
+                    parsed = dtyper.parse_datetime_series(dt, schema=schema)
+                    if (parsed.isna() & dt.notna()).any():
+                        raise ValueError("some values can't be parsed as datetime")
+                    dt = parsed
+                else:
+                    dt = dt.astype(dtyper.pdtyper(_first_converted))
                 logger.info("`%s` is converted to %s properly",
                         dt.name, type(_first_converted))
                 return dt, type(_first_converted)
@@ -55,8 +119,17 @@ def convert_series_dtype(dt):
     elif dt.dtype == object:
 
         # find and convert the values that need to be converted manually
-        dt = dt.map(lambda x: utils.convert_type(x, tgt=type(_first)) \
-            if isinstance(x, str) else x)
+        # P.S.
+        # 1. Range strings for numeric target are parsed column-wise
+        # 2. Only unique values are converted, with memo shared across series
+        tgt = type(_first)
+        if tgt in dtyper.TYPE_ENUMS["int"] or tgt in dtyper.TYPE_ENUMS["float"]:
+            intervals = pd.Series(dtyper.parse_range_series(dt),
+                index=dt.index, name=dt.name).astype(object)
+            dt = dt.mask(intervals.notna(), intervals)
+        else:
+            dt = convert_uniques(dt, lambda x: dtyper.convert_type_cached(x, tgt=tgt) \
+                if isinstance(x, str) else x)
 
         # try to convert the whole series' dtype
         try:
@@ -116,13 +189,13 @@ def categorize_feature(dt, tgt, max_categories=20, predef=[], *,
     if len(_value_count) > max_categories:
         # `datetime64`/`string` can't be converted into proper
         # dtype, or namely can't be categorized
-        if _type in utils.TYPE_ORDERED:
+        if _type in dtyper.TYPE_ORDERED:
             # use Descision Tree as default spliter for ordered
             # `NaN` will be filled with "nan" here
             spliter = spliter or dtool.tree_spliter
             categorized_dt, categories = spliter(dt, tgt, max_categories, predef)
 
-            woes, monotonic = calculator.get_woe_iv(categorized_dt, tgt)
+            woes, monotonic = calculator.calculate_woe_iv(categorized_dt, tgt)
             # warn if woes is not monotonic
             if not monotonic:
                 logger.warning("`%s`'s woe values isn't monotonic", dt.name)
@@ -139,6 +212,113 @@ def categorize_feature(dt, tgt, max_categories=20, predef=[], *,
         #   be raised if elements in `dt` arn't comparable
         #   for they will be set as index after `groupby`
         dt = dt.fillna("nan").astype("category")
-        woes, _ = calculator.get_woe_iv(dt, tgt)
+        woes, _ = calculator.calculate_woe_iv(dt, tgt)
         return woes, dt
 
+# %%
+def _share_array(arr: np.ndarray, blocks: list) -> tuple:
+    """
+    Description:
+    Copy array into a new shared memory block, which will be appended to
+    `blocks` to be released by caller.
+
+    Return:
+    spec: (block name, dtype, shape) to attach the array in workers
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    blocks.append(shm)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    return shm.name, arr.dtype.str, arr.shape
+
+def _attach_series(data: Any, name: Any) -> pd.Series:
+    """
+    Description:
+    Copy array out of shared memory with spec from `_share_array`, or
+    return series pickled directly.
+    """
+    if isinstance(data, pd.Series):
+        return data
+    shm_name, dtype, shape = data
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        arr = np.array(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    finally:
+        shm.close()
+    return pd.Series(arr, name=name)
+
+def _categorize_task(task: tuple) -> tuple:
+    """
+    Description:
+    Run `categorize_feature` for one column in worker.
+    """
+    col, data, tgt_data, max_categories, predef, spliter = task
+    dt = _attach_series(data, col)
+    tgt = _attach_series(tgt_data, None)
+    return categorize_feature(dt, tgt, max_categories, predef, spliter=spliter)
+
+def categorize_frame(df, tgt, max_categories=20, predef=[], *,
+    spliter=None, n_jobs=None, chunksize=1):
+    """
+    Description:
+    Categorize all columns in dataframe with `categorize_feature` in
+    process pool.
+    1. Columns are scheduled from the largest to the smallest, measured by
+       deep memory usage, in chunks of `chunksize`
+    2. Only the column and the target are sent to each worker, and
+       numeric and datetime ones are passed through shared memory instead
+       of pickling
+
+    P.S.
+    Object columns can't be put in shared memory, so they are pickled.
+
+    Params:
+    df: dataframe
+    tgt: target series aligned with `df`
+    max_categories: the maximum of the number of categories,
+        except pre-defined categories
+    predef: categories which is pre-defined, or mapper from column to
+        its categories
+    spliter: function to split columns into stops, which must be
+        picklable
+    n_jobs: the number of processes, `os.cpu_count()` as default, and
+        columns will be categorized in current process if `n_jobs` is 1
+    chunksize: the number of columns sent to a worker at once
+
+    Return:
+    {column: (woes, categorized series)} in the order of `df`'s columns,
+        in which each tuple is just what `categorize_feature` returns
+    """
+    def get_predef(col):
+        return predef.get(col, []) if isinstance(predef, (dict, pd.Series)) \
+            else predef
+
+    order = df.memory_usage(index=False, deep=True) \
+        .sort_values(ascending=False, kind="stable").index
+    if n_jobs == 1:
+        rets = {col: categorize_feature(df[col], tgt, max_categories,
+            get_predef(col), spliter=spliter) for col in order}
+        return {col: rets[col] for col in df.columns}
+
+    blocks = []
+    try:
+        def share(dt):
+            if dt.dtype.kind in "biufM":
+                return _share_array(dt.to_numpy(), blocks)
+            return dt.reset_index(drop=True)
+
+        tgt_data = share(pd.Series(tgt))
+        tasks = [(col, share(df[col]), tgt_data, max_categories,
+            get_predef(col), spliter) for col in order]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            rets = dict(zip(order, executor.map(_categorize_task, tasks,
+                chunksize=chunksize)))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    # Restore index dropped in workers
+    for col, (woes, categorized) in rets.items():
+        if categorized is not None:
+            categorized.index = df.index
+    return {col: rets[col] for col in df.columns}
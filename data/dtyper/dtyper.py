@@ -7,11 +7,14 @@
 #   Description:
 #----------------------------------------------------------
 #%%
-from typing import (Union, Any)
+from typing import (Union, Any, Tuple)
 import pandas as pd 
 import numpy as np 
 import re
 import logging
+import weakref
+from functools import lru_cache
+from .. import xtype
 #%%
 logger = logging.getLogger("xutils.dtype")
 
@@ -33,6 +36,16 @@ TYPE_REGEX = {
     "frozenset": "\([+-]?\d+(?:\.\d*)?, *[+-]?\d+(?:\.\d*)?\)",
     "nan": "nan",
 }
+# Compiled patterns for each type
+TYPE_PATTERNS = {k: re.compile(v) for k, v in TYPE_REGEX.items()}
+# Combined pattern with named group for each type, so that the type could
+# be classified with one match, in which the first type matched wins just
+# like matching in the order of `TYPE_REGEX`
+TYPE_CLASSIFIER = re.compile("|".join(
+    [f"(?P<{k}>{v})" for k, v in TYPE_REGEX.items()]
+))
+# Size of memo for `convert_type_cached`
+CONVERT_CACHE_SIZE = 4096
 TYPE_CONVERTER = {
     "int": int,
     "float": float,
@@ -140,11 +153,62 @@ def isin(ele: Any, container: Any) -> bool:
         return ele in container
 
 #%%
+# Label-position hash indices: {id(index): (weakref of index, {label: position})}
+INDEX_POSITIONS = {}
+
+def _drop_index_positions(ref: weakref.ref, key: int) -> None:
+    """
+    Description:
+    Callback for weakref to drop hash index of index collected, unless the
+    id has been reused by another index.
+    """
+    cached = INDEX_POSITIONS.get(key)
+    if cached is not None and cached[0] is ref:
+        del INDEX_POSITIONS[key]
+
+def index_positions(index: pd.Index) -> dict:
+    """
+    Description:
+    Get hash index mapping labels to positions in `index`, which is built
+    only once for each index object and dropped when the index is
+    collected.
+    1. Pandas index is immutable, so reassigning index of series or df
+       brings new hash index naturally
+    2. The first position is kept for duplicate labels, just like
+       `list.index`
+
+    Params:
+    index: pandas index
+
+    Return:
+    {label: position}
+    """
+    key = id(index)
+    cached = INDEX_POSITIONS.get(key)
+    if cached is not None and cached[0]() is index:
+        return cached[1]
+
+    n = len(index)
+    positions = dict(zip(index[::-1], range(n - 1, -1, -1)))
+    ref = weakref.ref(index, lambda ref, key=key: _drop_index_positions(ref, key))
+    INDEX_POSITIONS[key] = (ref, positions)
+    return positions
+
+def clear_index_positions() -> None:
+    """
+    Description:
+    Drop all hash indices built by `index_positions`.
+    """
+    INDEX_POSITIONS.clear()
+
 def pdidx(dt: Union[pd.Series, pd.DataFrame], idxer: Any) -> Any:
     """
     Description:
     1. Pandas regard set, forzenset, etc as list-like indexer,
         so frozenset can't be used to fetch value directly
+    2. Labels are looked up in hash index from `index_positions`, and
+        `dt.loc` is used for labels not found or index not unique, so that
+        scalars in intervals could still be fetched from `IntervalIndex`
 
     Params:
     dt: series or df
@@ -152,10 +216,21 @@ def pdidx(dt: Union[pd.Series, pd.DataFrame], idxer: Any) -> Any:
 
     Return:
     """
+    positions = index_positions(dt.index)
     if type(idxer) in TYPE_ENUMS["frozenset"]:
-        return dt.iloc[list(dt.index).index(idxer)]
-    else:
-        return dt.loc[idxer]
+        # `set` is unhashable, but equals to frozenset with same elements
+        pos = positions.get(frozenset(idxer))
+        if pos is None:
+            raise ValueError(f"{idxer!r} is not in index")
+        return dt.iloc[pos]
+
+    try:
+        pos = positions.get(idxer)
+    except TypeError:
+        pos = None
+    if pos is not None and dt.index.is_unique:
+        return dt.iloc[pos]
+    return dt.loc[idxer]
 
 #%%
 def is_overlapped(seq: list, *, sorted_: bool = False) -> bool:
@@ -312,6 +387,22 @@ def pdtyper(ele: Any) -> Any:
     else:
         return type(ele)
 
+#%%
+def classify_type(ele_str: str) -> Union[str, None]:
+    """
+    Description:
+    Classify string into types in `TYPE_REGEX` with one match of
+    `TYPE_CLASSIFIER`
+
+    Params:
+    ele_str: string
+
+    Return:
+    type name, or None if no type matched
+    """
+    matched = TYPE_CLASSIFIER.fullmatch(ele_str)
+    return matched.lastgroup if matched else None
+
 #%%
 def convert_type(ele_str, *, tgt=None) -> Any:
     """
@@ -332,9 +423,9 @@ def convert_type(ele_str, *, tgt=None) -> Any:
     # these kinds of values with goal data type could be
     # converted to original string properly
     if not tgt:
-        for k, v in TYPE_REGEX.items():
-            if re.match(v+"$", ele_str):
-                return TYPE_CONVERTER[k](ele_str)
+        type_ = classify_type(ele_str)
+        if type_:
+            return TYPE_CONVERTER[type_](ele_str)
         else:
             return ele_str
     # try to convert to target dtype
@@ -349,7 +440,7 @@ def convert_type(ele_str, *, tgt=None) -> Any:
                 tgt = "float"
 
             # find possible values according to regex
-            _ret = re.findall(TYPE_REGEX[tgt], ele_str)
+            _ret = TYPE_PATTERNS[tgt].findall(ele_str)
 
             # convert string with pattern like ">10", "大于10" to
             # pd.Interval(10, inf)
@@ -386,3 +477,504 @@ def convert_type(ele_str, *, tgt=None) -> Any:
         # other target data type need to be added
         else:
             raise ValueError("can't convert `%s` to `%s`" % (ele_str, tgt))
+
+#%%
+# Numpy dtype kinds and types in `TYPE_REGEX`
+KIND_TYPES = {
+    "i": "int",
+    "u": "int",
+    "f": "float",
+    "M": "datetime64",
+}
+
+def infer_series_type(dt: pd.Series) -> Tuple[pd.Series, str]:
+    """
+    Description:
+    Infer the data type of the whole series in vectorized way, instead of
+    checking elements one by one.
+    1. Series with numeric or datetime dtype: determined by dtype directly
+    2. Series with object dtype: get unique values and their counts with
+       `value_counts`, then match unique strings against each pattern in
+       `TYPE_REGEX` with `Series.str.fullmatch` and check types of
+       unique non-strings with `TYPE_ENUMS`
+
+    Params:
+    dt: series
+
+    Return:
+    counts: series of number of valid elements matching each type,
+        in which "nan" counts the elements matching "nan"
+    best: the first type in `TYPE_REGEX` that all valid elements match,
+        "nan" if no valid elements, "str" if no type matches all elements
+        of object series, "other" for other dtypes
+    """
+    counts = pd.Series(0, index=list(TYPE_REGEX.keys()), dtype=np.int64)
+    if dt.dtype.kind != "O":
+        best = KIND_TYPES.get(dt.dtype.kind, "other")
+        if best in counts.index:
+            counts[best] = dt.count()
+            # Integers are floats too
+            if best == "int":
+                counts["float"] = counts["int"]
+        return counts, best
+
+    # Count on unique values only
+    vc = dt.value_counts(dropna=True)
+    uniques, freqs = vc.index.to_numpy(dtype=object), vc.to_numpy()
+    is_str = np.fromiter((isinstance(ele, str) for ele in uniques),
+        dtype=bool, count=len(uniques))
+    strs = pd.Series(uniques[is_str], dtype=object)
+    str_freqs, other_freqs = freqs[is_str], freqs[~is_str]
+    other_types = pd.Series([type(ele) for ele in uniques[~is_str]], dtype=object)
+    for type_, pattern in TYPE_REGEX.items():
+        counts[type_] = str_freqs[strs.str.fullmatch(pattern).to_numpy(dtype=bool)].sum()
+        if type_ != "nan":
+            counts[type_] += other_freqs[other_types.isin(TYPE_ENUMS[type_]).to_numpy()].sum()
+    counts["float"] += other_freqs[other_types.isin(TYPE_ENUMS["int"]).to_numpy()].sum()
+
+    n_valid = freqs.sum() - counts["nan"]
+    if n_valid == 0:
+        return counts, "nan"
+    for type_ in TYPE_REGEX:
+        if type_ != "nan" and counts[type_] == n_valid:
+            return counts, type_
+    return counts, "str"
+
+def convert_series_type(
+    dt: pd.Series,
+    type_: str,
+    *,
+    schema: Any = None
+) -> pd.Series:
+    """
+    Description:
+    Convert series into `type_` inferred by `infer_series_type` in
+    vectorized way, elements that can't be converted, "nan" included,
+    will be set as `NaN`.
+    1. "int", "float": `pd.to_numeric` on unique values factorized, and
+       "int" with `NaN` will be nullable "Int64"
+    2. "datetime64": `parse_datetime_series` with format sniffed
+    3. "interval": `xtype.parse_intervals`
+    4. "frozenset": `TYPE_CONVERTER` on unique values only
+
+    Params:
+    dt: series
+    type_: type name in `TYPE_REGEX`, and series will be returned directly
+        for others
+    schema: hashable to tell apart columns with the same name in
+        different tables, passed to `parse_datetime_series`
+
+    Return:
+    converted series
+    """
+    if type_ not in TYPE_REGEX or (dt.dtype.kind != "O" and type_ != "nan"):
+        return dt
+
+    nan_mask = dt.isna() | (dt == "nan")
+    valid = dt.mask(nan_mask)
+    if type_ == "nan":
+        return pd.Series(np.nan, index=dt.index, name=dt.name)
+    elif type_ in ("int", "float", "datetime64"):
+        # Convert unique values only and take back with codes
+        if type_ == "datetime64":
+            return parse_datetime_series(valid, schema=schema)
+        codes, uniques = pd.factorize(valid)
+        converted = pd.to_numeric(pd.Series(uniques, dtype=object),
+            errors="coerce", dtype_backend="numpy_nullable").array
+        # Take integers back without float, which can't hold integers
+        # larger than 2 ** 53 exactly, IDs for example
+        if type_ == "int" and converted.dtype.kind in "iu":
+            converted = pd.Series(converted.take(codes, allow_fill=True),
+                index=dt.index, name=dt.name)
+            if converted.isna().any():
+                return converted
+            return converted.astype(converted.dtype.numpy_dtype)
+        converted = np.append(converted.to_numpy(dtype=float, na_value=np.nan),
+            np.nan)
+        return pd.Series(converted[codes], index=dt.index, name=dt.name)
+    elif type_ == "interval":
+        return pd.Series(xtype.parse_intervals(valid.astype(str), how="pandas"),
+            index=dt.index, name=dt.name)
+    else:
+        uniques = valid.dropna().unique()
+        mapping = {}
+        for ele in uniques:
+            try:
+                mapping[ele] = TYPE_CONVERTER[type_](ele) \
+                    if isinstance(ele, str) else ele
+            except ValueError:
+                mapping[ele] = np.nan
+        return valid.map(mapping)
+
+def sample_series_type(
+    dt: pd.Series,
+    threshold: float = 0.99,
+    *,
+    max_samples: int = 10000,
+    batch: int = 512,
+    strata: int = 16,
+    z: float = 1.96,
+    seed: Any = None
+) -> Tuple[str, float]:
+    """
+    Description:
+    Infer the data type of series with stratified random sample, instead
+    of checking all elements like `infer_series_type`.
+    1. Split positions of `dt` into `strata` contiguous strata, and draw
+       random positions without replacement in each stratum
+    2. Classify the sample in batches, each of which takes positions from
+       all strata, with `infer_series_type`
+    3. Stop early once the Wilson score interval of the conformance rate of
+       the leading type is above or below `threshold`
+
+    Params:
+    dt: series
+    threshold: conformance rate required
+    max_samples: the maximum of the number of elements sampled
+    batch: the number of elements classified in each round
+    strata: the number of strata
+    z: z-score for the confidence of Wilson score interval
+    seed: seed for `np.random.default_rng`
+
+    Return:
+    best: type in `TYPE_REGEX` that most valid elements in sample match,
+        "nan" if no valid elements, or dtype-determined type like
+        `infer_series_type` for non-object series
+    rate: estimated proportion of valid elements conforming to `best`
+    """
+    n = len(dt)
+    if dt.dtype.kind != "O" or n <= batch:
+        counts, best = infer_series_type(dt)
+        if best not in counts.index:
+            return best, 1.0
+        n_valid = dt.count() - counts["nan"]
+        if n_valid == 0:
+            return "nan", 1.0
+        if best == "str":
+            best = counts.drop("nan").idxmax()
+        return best, float(counts[best] / n_valid)
+
+    rng = np.random.default_rng(seed)
+    bounds = np.linspace(0, n, min(strata, n) + 1).astype(np.int64)
+    per_stratum = -(-min(max_samples, n) // (len(bounds) - 1))
+    samples = [lo + rng.choice(hi - lo, min(per_stratum, hi - lo), replace=False)
+        for lo, hi in zip(bounds[:-1], bounds[1:])]
+    step = max(batch // len(samples), 1)
+
+    counts = pd.Series(0, index=list(TYPE_REGEX.keys()), dtype=np.int64)
+    n_valid = 0
+    best, rate = "nan", 1.0
+    for start in range(0, per_stratum, step):
+        pos = np.concatenate([sample[start: start + step] for sample in samples])
+        part = dt.iloc[pos]
+        part_counts, _ = infer_series_type(part)
+        counts += part_counts
+        n_valid += part.count() - part_counts["nan"]
+        if n_valid == 0:
+            continue
+
+        best = counts.drop("nan").idxmax()
+        rate = float(counts[best] / n_valid)
+        # Wilson score interval
+        center = (rate + z ** 2 / (2 * n_valid)) / (1 + z ** 2 / n_valid)
+        margin = z / (1 + z ** 2 / n_valid) \
+            * np.sqrt(rate * (1 - rate) / n_valid + z ** 2 / (4 * n_valid ** 2))
+        if center - margin >= threshold or center + margin < threshold:
+            break
+
+    return best, rate
+
+#%%
+# Candidate formats for `sniff_datetime_format`, ordered by priority
+DATETIME_FORMATS = [
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y%m%d",
+    "%Y年%m月%d日",
+]
+# Formats sniffed: {(schema, column name): format}
+DATETIME_FORMAT_CACHE = {}
+DATETIME_SAMPLE_SIZE = 1000
+
+def sniff_datetime_format(strs: pd.Series) -> Union[str, None]:
+    """
+    Description:
+    Detect the format in `DATETIME_FORMATS` that parses most of `strs`.
+
+    Params:
+    strs: series of strings, a small sample usually
+
+    Return:
+    format, or None if no format parses any string
+    """
+    best, best_n = None, 0
+    for fmt in DATETIME_FORMATS:
+        n = pd.to_datetime(strs, format=fmt, errors="coerce").count()
+        if n > best_n:
+            best, best_n = fmt, n
+            if n == len(strs):
+                break
+    return best
+
+def parse_datetime_series(
+    dt: pd.Series,
+    *,
+    schema: Any = None,
+    sample_size: int = DATETIME_SAMPLE_SIZE
+) -> pd.Series:
+    """
+    Description:
+    Parse series into datetime with explicit `format`, instead of inferring
+    format for each element.
+    1. Factorize `dt` and parse unique values only
+    2. Get format from `DATETIME_FORMAT_CACHE` with `schema` and name of
+       `dt`, or sniff it from a sample of unique values and cache it
+    3. Parse all unique values with the format
+    4. Fall back to `TYPE_CONVERTER["datetime64"]` for values that don't
+       match the format individually
+
+    P.S.
+    Format cached will be sniffed again if it matches none of the values.
+
+    Params:
+    dt: series
+    schema: hashable to tell apart columns with the same name in
+        different tables
+    sample_size: the number of unique values to sniff format from
+
+    Return:
+    series of datetime64, in which values can't be parsed are `NaT`
+    """
+    codes, uniques = pd.factorize(dt)
+    uniques = pd.Series(uniques, dtype=object)
+    strs = uniques[uniques.map(type) == str]
+
+    key = (schema, dt.name)
+    fmt = DATETIME_FORMAT_CACHE.get(key)
+    parsed = None
+    if fmt is not None:
+        parsed = pd.to_datetime(uniques, format=fmt, errors="coerce")
+        if len(strs) > 0 and parsed.count() == 0:
+            fmt = parsed = None
+    if fmt is None:
+        fmt = sniff_datetime_format(strs.iloc[:sample_size])
+        if fmt is not None:
+            DATETIME_FORMAT_CACHE[key] = fmt
+            logger.info("Format `%s` is sniffed for `%s`", fmt, dt.name)
+    if parsed is None:
+        parsed = pd.to_datetime(uniques, format=fmt, errors="coerce") \
+            if fmt is not None else pd.Series(pd.NaT, index=uniques.index,
+                dtype="datetime64[ns]")
+
+    # Fall back for values that don't match the format
+    fallback = {}
+    for idx in parsed.index[parsed.isna() & uniques.notna()]:
+        try:
+            fallback[idx] = TYPE_CONVERTER["datetime64"](uniques[idx])
+        except (ValueError, TypeError):
+            pass
+    if fallback:
+        parsed = parsed.astype(object)
+        parsed[list(fallback.keys())] = list(fallback.values())
+        parsed = pd.to_datetime(parsed, errors="coerce")
+
+    # Code -1 for `NaN`
+    converted = np.append(parsed.to_numpy(),
+        np.array(["NaT"], dtype=parsed.dtype))
+    return pd.Series(converted[codes], index=dt.index, name=dt.name)
+
+#%%
+# Integer dtypes for `optimize_frame`, ordered by width
+INT_DOWNCASTS = [np.int8, np.int16, np.int32, np.int64]
+UINT_DOWNCASTS = [np.uint8, np.uint16, np.uint32, np.uint64]
+
+def downcast_series(dt: pd.Series, category_ratio: float = 0.5) -> pd.Series:
+    """
+    Description:
+    Downcast series to the smallest safe dtype.
+    1. Integers: the narrowest integer dtype holding min and max, unsigned
+       ones for non-negative series
+    2. Floats: float32 only if all values are kept exactly
+    3. Object: category if the ratio of unique values to non-null values
+       is no more than `category_ratio`
+
+    Params:
+    dt: series
+    category_ratio: maximum ratio of unique values for category
+
+    Return:
+    downcast series, or `dt` itself if nothing can be done
+    """
+    kind = dt.dtype.kind
+    # Nullable dtypes, `Int64`, `Float64`, etc, are downcast to nullable
+    # dtypes with narrower width
+    nullable = isinstance(dt.dtype, pd.api.extensions.ExtensionDtype)
+    if kind in "iu" and dt.count() > 0:
+        lo, hi = dt.min(), dt.max()
+        for type_ in (UINT_DOWNCASTS if lo >= 0 else INT_DOWNCASTS):
+            info = np.iinfo(type_)
+            if info.min <= lo and hi <= info.max:
+                name = np.dtype(type_).name
+                if nullable:
+                    name = name.replace("uint", "UInt").replace("int", "Int")
+                return dt if name == str(dt.dtype) else dt.astype(name)
+    elif kind == "f" and dt.dtype.itemsize > 4:
+        if nullable:
+            casted = dt.astype("Float32")
+            if casted.astype(dt.dtype).equals(dt):
+                return casted
+            return dt
+        values = dt.to_numpy()
+        with np.errstate(over="ignore"):
+            casted = values.astype(np.float32)
+        if np.array_equal(casted.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(casted, index=dt.index, name=dt.name)
+    elif kind == "O":
+        n_valid = dt.count()
+        if n_valid > 0 and dt.nunique() <= n_valid * category_ratio:
+            return dt.astype("category")
+    return dt
+
+def optimize_frame(
+    df: pd.DataFrame,
+    *,
+    category_ratio: float = 0.5,
+    dtype_map: bool = False
+) -> Union[Tuple[pd.DataFrame, pd.DataFrame],
+        Tuple[pd.DataFrame, pd.DataFrame, dict]]:
+    """
+    Description:
+    Reduce memory of dataframe by downcasting each column with
+    `downcast_series`, which should be called after dtypes are inferred,
+    with `converter.convert_series_dtype` for example.
+
+    Params:
+    df: dataframe
+    category_ratio: maximum ratio of unique values for category
+    dtype_map: if to return dtype map for columns, which could be passed
+        to `pd.read_csv(dtype=...)` directly
+
+    Return:
+    df: optimized dataframe
+    report: dataframe with columns `dtype_before`, `dtype_after`,
+        `bytes_before`, `bytes_after` indexed by column names
+    dtypes: {column: dtype name}, returned only if `dtype_map` is set,
+        where datetime columns are excluded for they should be passed
+        to `parse_dates` instead, and the last one is kept for duplicate
+        column names
+    """
+    # Assign columns back by position, so duplicate names are kept
+    df, records = df.copy(deep=False), []
+    for pos, col in enumerate(df.columns):
+        dt = df.iloc[:, pos]
+        opt = downcast_series(dt, category_ratio)
+        if opt is not dt:
+            df.isetitem(pos, opt)
+        records.append((col, str(dt.dtype), str(opt.dtype),
+            dt.memory_usage(index=False, deep=True),
+            opt.memory_usage(index=False, deep=True)))
+    report = pd.DataFrame.from_records(records, columns=["column",
+        "dtype_before", "dtype_after", "bytes_before", "bytes_after"]) \
+        .set_index("column")
+    logger.info("Memory is reduced from %d bytes to %d bytes",
+        report["bytes_before"].sum(), report["bytes_after"].sum())
+
+    if dtype_map:
+        dtypes = {col: str(dt.dtype) for col, dt in df.items()
+            if dt.dtype.kind != "M"}
+        return df, report, dtypes
+    return df, report
+
+#%%
+@lru_cache(maxsize=CONVERT_CACHE_SIZE)
+def convert_type_cached(ele_str, *, tgt=None) -> Any:
+    """
+    Description:
+    `convert_type` with LRU memo shared by all callers, so that common
+    tokens like "nan", ">10", "10-20" in different series will be converted
+    only once.
+
+    P.S.
+    Values returned are shared, so don't alter them.
+
+    Params:
+    ele_str: string
+    tgt: target dtype, which must be hashable
+
+    Return:
+    value with proper date type
+    """
+    return convert_type(ele_str, tgt=tgt)
+
+#%%
+# Patterns for range strings like ">10", "10-20", "10至20之间"
+RANGE_NUM = r"[+-]?\d+(?:\.\d*)?"
+RANGE_GT = "大|>"
+RANGE_LT = "小|<"
+RANGE_BETWEEN = "-|至|间"
+RANGE_PAIR = rf"^\D*?({RANGE_NUM})\D+?({RANGE_NUM})\D*$"
+
+def parse_range_series(
+    dt: pd.Series,
+    how: str = "pandas"
+) -> Union[pd.arrays.IntervalArray, xtype.IntervalSet]:
+    """
+    Description:
+    Parse range strings in the whole series into intervals in vectorized
+    way, just like `convert_type` with `tgt` of "int" or "float" does for
+    each string.
+    1. Factorize `dt` and parse unique values only
+    2. Classify strings with `Series.str.contains`:
+       ">10", "大于10" -> (10, inf]
+       "<10", "小于10" -> (-inf, 10]
+       "10-20", "10至20", "10到20之间" -> (10, 20]
+    3. Extract numbers with `Series.str.extract`
+    4. Take edges back with codes, and log summary in one line
+
+    Params:
+    dt: series
+    how: how to return the intervals
+        "pandas": `pd.arrays.IntervalArray` aligned with `dt`, in which
+            elements can't be parsed, non-strings included, are `NaN`
+        "set": `xtype.IntervalSet`
+
+    Return:
+    intervals in format determined by `how`
+    """
+    codes, uniques = pd.factorize(dt)
+    strs = pd.Series(uniques, dtype=object)
+    # Non-strings will get `NaN` in `.str` methods
+    is_gt = strs.str.contains(RANGE_GT).fillna(False).to_numpy(dtype=bool)
+    is_lt = strs.str.contains(RANGE_LT).fillna(False).to_numpy(dtype=bool) & ~is_gt
+    first = pd.to_numeric(strs.str.extract(f"({RANGE_NUM})", expand=False),
+        errors="coerce").to_numpy(dtype=float)
+    pair = strs.str.extract(RANGE_PAIR, expand=True)
+    pair_left = pd.to_numeric(pair[0], errors="coerce").to_numpy(dtype=float)
+    pair_right = pd.to_numeric(pair[1], errors="coerce").to_numpy(dtype=float)
+    is_between = strs.str.contains(RANGE_BETWEEN).fillna(False).to_numpy(dtype=bool) \
+        & ~np.isnan(pair_left) & ~is_gt & ~is_lt
+    is_gt = is_gt & ~np.isnan(first)
+    is_lt = is_lt & ~np.isnan(first)
+
+    left = np.select([is_gt, is_lt, is_between],
+        [first, -np.inf, pair_left], np.nan)
+    right = np.select([is_gt, is_lt, is_between],
+        [np.inf, first, pair_right], np.nan)
+    # Code -1 for `NaN`
+    left, right = np.append(left, np.nan)[codes], np.append(right, np.nan)[codes]
+
+    # Summary of rows
+    kinds = np.select([is_gt, is_lt, is_between], [0, 1, 2], 3)
+    kinds = np.append(kinds, 4)[codes]
+    n_gt, n_lt, n_between, n_failed, _ = np.bincount(kinds, minlength=5)
+    logger.info("`%s`: %d values converted to intervals (%d greater-than, "
+        "%d less-than, %d between), %d values left unconverted",
+        dt.name, n_gt + n_lt + n_between, n_gt, n_lt, n_between, n_failed)
+
+    if how == "set":
+        return xtype.IntervalSet(left, right, False, True)
+    return pd.arrays.IntervalArray.from_arrays(left, right, closed="right")
@@ -12,9 +12,9 @@ import logging
 import pandas as pd 
 import numpy as np 
 from sklearn.tree import DecisionTreeClassifier as DTC
-from sklearn.tree import export as export
 from sklearn import datasets as sklds
-from . import dtyper
+from ..dtyper import dtyper
+from .. import xtype
 
 #%%
 logger = logging.getLogger("xutils.dtool")
@@ -97,7 +97,7 @@ def tree_spliter(dt, tgt, max_bins=5, predef=[], *,
     # rectify `min_samples_leaf` with valid ratio
     clf = clf or DTC(criterion="entropy",
             splitter="best",
-            min_samples_leaf=min_samples_leaf * (valid_dt_bool.sum() / df.shape[0]),
+            min_samples_leaf=min_samples_leaf * (valid_dt_bools.sum() / df.shape[0]),
             max_leaf_nodes=max_bins,
             class_weight="balanced",
             min_impurity_decrease=0.1,
@@ -109,12 +109,20 @@ def tree_spliter(dt, tgt, max_bins=5, predef=[], *,
     stops = np.array([valid_dt.min(), *stops, valid_dt.max()])
     logger.debug("get `%s`'s stops, %s, with decision tree", dt.name, stops)
 
-    # cut `dt` according to the stops
-    # Attention: `predef` shoudln't be in any interval defined
-        # by `stops`, or `predef` may be cut into some group
-    cut_dt = pd.cut(dt, stops, include_lowest=True) \
-        .cat.add_categories(["nan", *predef])
-    cut_dt[~valid_dt_bools] = dt[~valid_dt_bools].fillna("nan")
+    # cut `dt` according to the stops in one pass
+    # 1. the first interval includes the lowest just like `pd.cut`, and
+    #   so are the labels, `(min - eps, s1]` for the first interval
+    # 2. `NaN` is mapped to "nan", and `predef` is mapped to itself,
+    #   even if it's in some interval defined by `stops`
+    bins = [
+        pd.Interval(stops[0], stops[1], closed="both"),
+        *pd.IntervalIndex.from_breaks(stops[1:], closed="right"),
+        "nan",
+        *predef,
+    ]
+    labels = pd.cut(stops, stops, include_lowest=True).categories
+    cut_dt = xtype.Discretizer(bins, labels=[*labels, "nan", *predef]) \
+        .transform(dt)
 
     return cut_dt, cut_dt.cat.categories.to_list()
 
@@ -40,7 +40,7 @@ def calculate_woe_iv(cats, Y):
         ("g", lambda y: (y==0).sum()),
         ("b", lambda y: (y==1).sum()),
         ("t", "count")
-    ]).fillna(0)
+    ]).fillna(0).astype(float)
 
     # handle inf and 0 with laplace smoothing
     df_woes[(df_woes == 0).any(axis=1)] += LAPLACE_SMOOTH
@@ -32,13 +32,49 @@
 # %%
 from __future__ import annotations
 import re
+import heapq
+from bisect import (bisect_left, bisect_right)
+from operator import attrgetter
 from collections.abc import (Container, Iterator, Iterable, Sized, Callable)
 from collections import (deque, )
 from typing import (Any, Union, Tuple, )
-from .clctools import (flatten_iterable, separate_container)
+import numpy as np
+import pandas as pd
+from .clctools import (iter_flatten, partition_container)
 MINPAD = 1e-13
+# Binary layout of serialized intervals:
+# header: magic(8 bytes), interval count(int64), point count(int64)
+# body: left(float64), right(float64), including_left(bitmap),
+#   including_right(bitmap), points(float64)
+# Bitmaps are padded to 8 bytes so that all float arrays are aligned.
+BYTES_MAGIC = b"XTYPIV01"
+# Same layout with edges stored as int64 codes of `EncodedIntervalSet`
+BYTES_CODES_MAGIC = b"XTYPIC01"
+BYTES_HEADER = 24
+# Closedness of `pd.Interval`, `pd.IntervalIndex`, etc
+PD_CLOSED = {
+    (True, True): "both",
+    (True, False): "left",
+    (False, True): "right",
+    (False, False): "neither",
+}
+# Compiled patterns for parsing intervals, `Value`, etc
+INT_REGEX = re.compile(r"[+-]?\d+")
+INTERVAL_REGEX = re.compile(r"\s*([\[\(])\s*([^,\[\]\(\)]+?)\s*,\s*([^,\[\]\(\)]+?)\s*([\]\)])\s*")
+VALUE_TOKEN_REGEX = re.compile(r"[\[\(][^,\[\]\(\)]+,[^,\[\]\(\)]+[\]\)]|[^,{}\[\]\(\)]+")
 
 # %%
+def str2num(str_:str) -> Union[int, float]:
+    """
+    Description:
+    Convert `str_` into int if it's integer, else float, in which "inf",
+    "-inf" and "nan" are supported.
+    """
+    str_ = str_.strip()
+    if INT_REGEX.fullmatch(str_):
+        return int(str_)
+    return float(str_)
+
 def max_key(item: Any) -> Any:
     """
     Description:
@@ -73,8 +109,158 @@ def min_key(item: Any) -> Any:
     else:
         return item
 
+def _sorted_sized(sized:np.ndarray) -> list:
+    """
+    Description:
+    Sort and deduplicate points from `partition_container` into list, which
+    is vectorized for numeric arrays.
+    """
+    if sized.dtype != object:
+        return np.unique(sized).tolist()
+    return sorted(set(sized.tolist()))
+
+def _is_empty(other:Any) -> bool:
+    """
+    Description:
+    Check if `other` contains no elements, with `len` for sized containers
+    since truth values of arrays and series are ambiguous, and scalars,
+    `0` for example, are never empty.
+    """
+    if issubclass(type(other), Interval):
+        return not other
+    if issubclass(type(other), Sized):
+        return len(other) == 0
+    return False
+
+# %%
+# Positions for sweep kernels of `Interval`:
+# `(x, False)` stands for `x` itself and `(x, True)` stands for the position
+# just after `x`, so that each interval covers positions in `[start, end)`
+# exactly, without `MINPAD`.
+def _start_pos(itvl:Interval) -> tuple:
+    return (itvl.left, not itvl.including_left)
+
+def _end_pos(itvl:Interval) -> tuple:
+    return (itvl.right, itvl.including_right)
+
+def _sweep_intervals(
+    left_intervals:list,
+    right_intervals:list,
+    predicate:Callable
+) -> list:
+    """
+    Description:
+    Sweep edges of two trimmed intervals lists in one pass with two
+    pointers, and keep the spans where `predicate` holds.
+    1. Edges of each trimmed list are already in order, so just step the
+       pointer with smaller position
+    2. Toggle coverage of the list after each edge passed
+    3. Start a new interval when `predicate` turns on, and close it when
+       `predicate` turns off
+
+    Params:
+    left_intervals: trimmed [Interval, ]
+    right_intervals: trimmed [Interval, ]
+    predicate: callable accepting coverage of `left_intervals` and
+        `right_intervals`, which must return False if neither covers
+
+    Return:
+    [Interval, ]
+    """
+    streams = (left_intervals, right_intervals)
+    ends = (2 * len(left_intervals), 2 * len(right_intervals))
+    idxs, covered = [0, 0], [False, False]
+
+    def pos_at(side:int) -> tuple:
+        itvl = streams[side][idxs[side] // 2]
+        return _end_pos(itvl) if idxs[side] % 2 else _start_pos(itvl)
+
+    itvls, start, kept = [], None, False
+    while idxs[0] < ends[0] or idxs[1] < ends[1]:
+        if idxs[1] >= ends[1]:
+            pos = pos_at(0)
+        elif idxs[0] >= ends[0]:
+            pos = pos_at(1)
+        else:
+            pos = min(pos_at(0), pos_at(1))
+        # Pass all edges at `pos`, adjoined intervals included
+        for side in (0, 1):
+            while idxs[side] < ends[side] and pos_at(side) == pos:
+                covered[side] = not covered[side]
+                idxs[side] += 1
+        now_kept = predicate(*covered)
+        if now_kept and not kept:
+            start = pos
+        elif kept and not now_kept:
+            itvls.append(Interval(start[0], pos[0], not start[1], pos[1]))
+        kept = now_kept
+
+    return itvls
+
+def _locate_sized(intervals:list, sized:Iterable) -> list:
+    """
+    Description:
+    Locate each point in trimmed `intervals` in one pass with two pointers.
+
+    Params:
+    intervals: trimmed [Interval, ]
+    sized: sorted points
+
+    Return:
+    [index of interval containing the point or -1, ]
+    """
+    locs, idx = [], 0
+    for ele in sized:
+        pos = (ele, False)
+        while idx < len(intervals) and _end_pos(intervals[idx]) <= pos:
+            idx += 1
+        if idx < len(intervals) and _start_pos(intervals[idx]) <= pos:
+            locs.append(idx)
+        else:
+            locs.append(-1)
+    return locs
+
+def _cut_intervals(intervals:list, sized:Iterable, locs:list) -> list:
+    """
+    Description:
+    Cut trimmed `intervals` at points located by `_locate_sized`.
+    1. Intervals without any point inside are returned directly
+    2. Intervals with points inside are split into open pieces
+
+    Params:
+    intervals: trimmed [Interval, ]
+    sized: sorted points
+    locs: returned by `_locate_sized`
+
+    Return:
+    [Interval, ]
+    """
+    itvls, nxt, src = [], 0, None
+    rest, rest_incl = None, False
+    for ele, loc in zip(sized, locs):
+        if loc < 0:
+            continue
+        if loc >= nxt:
+            # Close the rest of the last interval cut
+            if src is not None and (rest, not rest_incl) < _end_pos(src):
+                itvls.append(Interval(rest, src.right, rest_incl, src.including_right))
+            itvls.extend(intervals[nxt:loc])
+            src, nxt = intervals[loc], loc + 1
+            rest, rest_incl = src.left, src.including_left
+        if (rest, not rest_incl) < (ele, False):
+            itvls.append(Interval(rest, ele, rest_incl, False))
+        rest, rest_incl = ele, False
+    if src is not None and (rest, not rest_incl) < _end_pos(src):
+        itvls.append(Interval(rest, src.right, rest_incl, src.including_right))
+    itvls.extend(intervals[nxt:])
+    return itvls
+
 # %%
 class Interval(Container):
+    # No `__dict__` for each instance
+    __slots__ = ("left", "right", "including_left", "including_right")
+    frozen = False
+
     def __init__(
         self,
         left:Union[int, float]=float("nan"),
@@ -92,6 +278,11 @@ class Interval(Container):
         1. Compare with other `Interval`, containers, int, etc
         2. Do addition, subtraction, etc with ohter containers, int, etc
 
+        P.S.
+        Intervals passed to methods with `mutable=False` won't be copied
+        until they need to be altered, so intervals returned may be shared
+        with the intervals passed. Use `freeze` to protect shared ones.
+
         Params:
         left:
         right:
@@ -104,17 +295,6 @@ class Interval(Container):
         self.including_right = including_right
         self.left = left
         self.right = right
-        self.__set_edge()
-
-    def __set_edge(self) -> None:
-        """
-        Description:
-        Set "edge" for comparsion:
-        1. including-left: `_left` = `left`
-        2. not including-let: `_left` = `left` + MINPAD
-        """
-        self._left = self.left if self.including_left else self.left + MINPAD
-        self._right = self.right if self.including_right else self.right - MINPAD
 
     def __contains__(self, item: Any, closed:bool=False) -> bool:
         """
@@ -137,6 +317,24 @@ class Interval(Container):
         else:
             return _min < item < _max
 
+    def contains_array(self, values:Iterable) -> np.ndarray:
+        """
+        Description:
+        Vectorized `__contains__` for each element in `values`.
+        1. Open edges are handled with the next float, instead of `MINPAD`
+        2. `nan` won't be contained in any interval
+
+        Params:
+        values: array-like of numbers
+
+        Return:
+        bool array with the same shape of `values`
+        """
+        values = np.asarray(values, dtype=float)
+        start = self.left if self.including_left else np.nextafter(self.left, INF)
+        end = self.right if self.including_right else np.nextafter(self.right, NINF)
+        return (start <= values) & (values <= end)
+
     def max(self) -> Union[int, float]:
         """
         Description:
@@ -187,30 +385,27 @@ class Interval(Container):
 
         Return:
         """
-        # If `self` contains no elements, return `other` directly
-        if not other:
-            return self.copy()
-
-        # If not mutable, copy `self`
-        if not mutable:
-            self_copy = self.copy()
-        else:
-            self_copy = self
+        # `Other`: LazyIntervals -> build expression lazily
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() + other
 
+        # If `other` contains no elements, return `self` directly
+        if _is_empty(other):
+            return self.copy()
 
         # `Other`: not iterable -> call `.extend` directly
         if not issubclass(type(other), Iterable):
+            # Copy `self` if not mutable or frozen
+            self_copy = self._writable(mutable)
             # `Other`: int, float, etc
-            if not issubclass(type(other), self.__class__):
-                _ret = self_copy.extend(self.__class__.from_single(other))
+            if not issubclass(type(other), Interval):
+                _ret = self_copy.extend(Interval.from_single(other))
                 if _ret:
                     return Value.from_raw({other, }, [self_copy, ])
                 else:
                     return self_copy
             # `Other`: Interval
             else:
-                if not mutable:
-                    other = other.copy()
                 _ret = self_copy.extend(other)
                 # Return intervals in only one interval returned,
                 #   else return value
@@ -222,21 +417,17 @@ class Interval(Container):
         # 1. Flatten and separate containers, non-containers in `other`
         # 2. call `intervals_union_intervals`, `intervals_union_sized`
         else:
-            other = flatten_iterable(other)
-            intervals, sized = separate_container(other)
-            # Copy if not mutable
-            if not mutable:
-                intervals = [itvl.copy() for itvl in intervals]
-
+            intervals, sized = partition_container(iter_flatten(other))
+            # Intervals will be copied on write if not mutable
             intervals = self.__class__.intervals_union_intervals(
-                [self_copy, ],
+                [self, ],
                 intervals,
-                mutable=True
+                mutable=mutable
             )
             sized, intervals = self.__class__.intervals_union_sized(
                 intervals,
-                sized,
-                mutable=True
+                _sorted_sized(sized),
+                mutable=mutable
             )
             # Return interval if only one interval returned,
             #   else return Value
@@ -259,48 +450,44 @@ class Interval(Container):
 
         Return:
         """
+        # `Other`: LazyIntervals -> build expression lazily
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() - other
+
         # Boundary cases
         # If `self` contains no elements, return null-interval directly
         if not self:
             return NAN_INTERVAL
 
-        # If not mutable, copy `self`
-        if not mutable:
-            self_copy = self.copy()
-        else:
-            self_copy = self
-
         # `Other`: int, float, Interval -> call `.remove` directly
         if not issubclass(type(other), Iterable):
-            if issubclass(type(other), self.__class__):
+            # Copy `self` if not mutable or frozen
+            self_copy = self._writable(mutable)
+            if issubclass(type(other), Interval):
                 return self_copy.remove(other)
             else:
-                return self_copy.remove(self.__class__.from_single(other))
+                return self_copy.remove(Interval.from_single(other))
         # `Other`: [int, float, Interval] -> call `.intervals_diff_XXX`
         else:
-            other = flatten_iterable(other)
-            intervals, sized = separate_container(other)
-            # Copy if not mutable
-            if not mutable:
-                intervals = [itvl.copy() for itvl in intervals]
-
-            self_copy = self.__class__.intervals_diff_intervals(
-                [self_copy, ],
+            intervals, sized = partition_container(iter_flatten(other))
+            # Intervals will be copied on write if not mutable
+            itvls = self.__class__.intervals_diff_intervals(
+                [self, ],
                 intervals,
-                mutable=True
+                mutable=mutable
             )
-            self_copy = self.__class__.intervals_diff_sized(
-                [self_copy, ],
-                sized,
-                mutable=True
+            itvls = self.__class__.intervals_diff_sized(
+                itvls,
+                _sorted_sized(sized),
+                mutable=mutable
             )
 
             # Return interval if only one interval returned,
             #   else return Value
-            if len(self_copy) == 1:
-                return self.copy[0]
+            if len(itvls) == 1:
+                return itvls[0]
             else:
-                return Value.from_raw(set(), self_copy)
+                return Value.from_raw(set(), itvls)
 
     def __repr__(self):
         """
@@ -367,18 +554,24 @@ class Interval(Container):
         else:
             itvls = sorted(intervals, key=min_key, reverse=True)
 
-        # Copy each interval if necessary
-        if not mutable:
-            itvls = [itvl.copy() for itvl in itvls]
-
         # Merge intervals in turn
-        merged = []
+        # P.S.
+        # Only the last merged interval will be altered, so copy it on
+        # write if it's not mutable, instead of copying each interval.
+        merged, last_owned = [], False
         while itvls:
             popout = itvls.pop()
+            # Drop null intervals, which would break the order
+            if _end_pos(popout) <= _start_pos(popout):
+                continue
             if merged and merged[-1].overlaps(popout):
+                if not last_owned:
+                    merged[-1] = merged[-1]._writable(mutable)
+                    last_owned = True
                 merged[-1].extend(popout)
             else:
                 merged.append(popout)
+                last_owned = mutable and not popout.frozen
 
         return merged
 
@@ -406,38 +599,34 @@ class Interval(Container):
         if not right_intervals:
             return left_intervals
 
-        # Copy intervals if not mutable
-        if not mutable:
-            left_intervals = [itvl.copy() for itvl in left_intervals]
-            right_intervals = [itvl.copy() for itvl in right_intervals]
-
         # Merge intervals from `left_intervals` and `right_intervals`
-        # in turn
-        itvls = []
+        # in turn, with the smaller minimum first
+        # P.S.
+        # It's better to put `overlap`/`extend` before `<` and `>`
+        # For `extend` will check if two intervals adjoines, which
+        # will make result more formal.
+        # P.S.
+        # Only the last merged interval will be altered, so copy it on
+        # write if it's not mutable.
+        itvls, last_owned = [], False
         lidx, ridx = 0, 0
-        while lidx < len(left_intervals) and right < len(right_intervals):
-            # P.S.
-            # It's better to put `overlap`/`extend` before `<` and `>`
-            # For `extend` will check if two intervals adjoines, which
-            # will make result more formal.
-            # P.S.
-            # This should also be applied in functions like add, union, etc.
-            # Certainly, functions like subtract, diff, etc could put
-            #   if condition as you like.
-            if left_intervals[lidx].extend(right_interval[ridx]):
-                ridx += 1
-            elif left_intervals[lidx] < right_intervals[ridx]:
-                itvls.append(left_intervals[lidx])
+        while lidx < len(left_intervals) or ridx < len(right_intervals):
+            if ridx >= len(right_intervals) or (lidx < len(left_intervals) \
+                and min_key(left_intervals[lidx]) <= min_key(right_intervals[ridx])):
+                cur = left_intervals[lidx]
                 lidx += 1
             else:
-                itvls.append(right_intervals[ridx])
+                cur = right_intervals[ridx]
                 ridx += 1
 
-        # Merge rest intervals
-        if left_intervals:
-            itvls.extend(left_intervals)
-        if right_intervals:
-            itvls.extend(right_intervals)
+            if itvls and itvls[-1].overlaps(cur):
+                if not last_owned:
+                    itvls[-1] = itvls[-1]._writable(mutable)
+                    last_owned = True
+                itvls[-1].extend(cur)
+            else:
+                itvls.append(cur)
+                last_owned = mutable and not cur.frozen
 
         return itvls
 
@@ -483,34 +672,41 @@ class Interval(Container):
             return left_intervals
 
         # Sort intervals in descending order
+        # P.S.
+        # Intervals in `left_intervals` will be copied on write, and
+        # `right_intervals` won't be altered at all.
         if trimmed:
-            if not mutable:
-                left_intervals = [itvl.copy() for itvl in left_intervals]
-                right_intervals = [itvl.copy() for itvl in right_intervals]
+            left_intervals = list(left_intervals)
         else:
             left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
             right_intervals = cls.trim_intervals(right_intervals, mutable=mutable)
 
         itvls = []
         lidx, ridx = 0, 0
+        lowned = False
         # Check and substract intervals in turn
         while lidx < len(left_intervals) and ridx < len(right_intervals):
             if left_intervals[lidx] < right_intervals[ridx]:
                 itvls.append(left_intervals[lidx])
                 lidx += 1
+                lowned = False
             elif right_intervals[ridx] < left_intervals[lidx]:
                 ridx += 1
             else:
+                if not lowned:
+                    left_intervals[lidx] = left_intervals[lidx]._writable(mutable)
+                    lowned = True
                 tmp_itvl = left_intervals[lidx].remove(right_intervals[ridx], keep_right=True)
                 if tmp_itvl:
                     itvls.append(tmp_itvl)
                 if not left_intervals[lidx]:
                     lidx += 1
+                    lowned = False
                 else:
                     ridx += 1
 
         # Extend with rest `left_intevals`
-        itvls.extend(reversed(left_intervals[lidx:]))
+        itvls.extend(left_intervals[lidx:])
         return itvls
 
     @classmethod
@@ -538,16 +734,13 @@ class Interval(Container):
         # `sized` won't be copied here even if not `mutable` and trimmed, 
         # because `pop` won't be used in this method, which means `sized`
         # won't be altered in this method.
-        if trimmed:
-            if not mutable:
-                left_intervals = [itvl.copy() for itvl in left_intervals]
-        else:
+        if not trimmed:
             left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
             right_sized = sorted(right_sized)
-        # Create intervals for each elements in `right_sized`
-        right_intervals = [Interval.from_single(ele) for ele in right_sized]
-
-        return cls.intervals_diff_intervals(left_intervals, right_intervals, True, True)
+        # Locate and cut intervals with points in one pass, instead of
+        # creating intervals for each elements in `right_sized`
+        locs = _locate_sized(left_intervals, right_sized)
+        return _cut_intervals(left_intervals, right_sized, locs)
 
     @classmethod
     def sized_diff_intervals(cls,
@@ -575,17 +768,11 @@ class Interval(Container):
         # `sized` won't be copied here even if not `mutable` and trimmed, 
         # because `pop` won't be used in this method, which means `sized`
         # won't be altered in this method.
-        if trimmed:
-            if not mutable:
-                right_intervals = [itvl.copy() for itvl in right_intervals]
-        else:
+        if not trimmed:
             right_intervals = cls.trim_intervals(right_intervals, mutable=mutable)
             left_sized = sorted(left_sized)
-        # Create intervals for each elements in `left_sized`
-        left_intervals = [Interval.from_single(ele) for ele in left_sized]
-
-        itvls = cls.intervals_diff_intervals(left_intervals, right_intervals, True, True)
-        return [itvl.left for itvl in itvls ]
+        locs = _locate_sized(right_intervals, left_sized)
+        return [ele for ele, loc in zip(left_sized, locs) if loc < 0]
 
     @classmethod
     def intervals_union_intervals(cls,
@@ -610,9 +797,51 @@ class Interval(Container):
         if trimmed:
             itvls = cls.merge_intervals(left_intervals, right_intervals, mutable=mutable)
         else:
-            itvls = cls.trim_intervals(left_intervals, right_intervals, mutable=mutable)
+            itvls = cls.trim_intervals([*left_intervals, *right_intervals], mutable=mutable)
         return itvls
 
+    @classmethod
+    def union_many(cls,
+        intervals_list:Iterable,
+        trimmed:bool=False,
+        mutable:bool=False
+    ) -> list:
+        """
+        Description:
+        Join all intervals in `intervals_list` with one k-way sweep,
+        instead of joining them pairwise.
+        1. Trim each intervals if not trimmed
+        2. Merge sorted intervals with heap, and concatenate intervals
+           overlapping with the last one in turn
+
+        Params:
+        intervals_list: [[Interval, ], ]
+        trimmed: if each intervals in `intervals_list` are trimmed
+        mutable
+
+        Return:
+        [Union of intervals, ]
+        """
+        if not trimmed:
+            intervals_list = [cls.trim_intervals(itvls, mutable=mutable)
+                for itvls in intervals_list]
+
+        # P.S.
+        # Only the last merged interval will be altered, so copy it on
+        # write if it's not mutable.
+        merged, last_owned = [], False
+        for cur in heapq.merge(*intervals_list, key=min_key):
+            if merged and merged[-1].overlaps(cur):
+                if not last_owned:
+                    merged[-1] = merged[-1]._writable(mutable)
+                    last_owned = True
+                merged[-1].extend(cur)
+            else:
+                merged.append(cur)
+                last_owned = mutable and not cur.frozen
+
+        return merged
+
     @classmethod
     def intervals_union_sized(cls,
         left_intervals:Iterable,
@@ -638,36 +867,42 @@ class Interval(Container):
         # `sized` won't be copied here even if not `mutable` and trimmed, 
         # because `pop` won't be used in this method, which means `sized`
         # won't be altered in this method.
-        if trimmed:
-            if not mutable:
-                left_intervals = [itvl.copy() for itvl in left_intervals]
-                right_sized = right_sized.copy()
-        else:
+        if not trimmed:
             left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
             right_sized = sorted(right_sized)
 
         # Check if elements in intervals for each element in `sized`
+        # P.S.
+        # Interval will be copied on write, when its edge needs to be
+        # included.
         sized, itvls = set(), []
         lidx, ridx = 0, 0 
         while lidx < len(left_intervals) and ridx < len(right_sized):
-            if right_sized[ridx] < left_intervals[lidx].left:
-                sized.append(right_sized[ridx])
+            cur = left_intervals[lidx]
+            if right_sized[ridx] < cur.left:
+                sized.add(right_sized[ridx])
                 ridx += 1
-            elif right_sized[ridx] == left_intervals[lidx].left:
-                left_intervals[lidx].including_left = True
+            elif right_sized[ridx] == cur.left:
+                if not cur.including_left:
+                    cur = cur._writable(mutable)
+                    cur.including_left = True
+                    left_intervals[lidx] = cur
                 ridx += 1
-            elif right_sized[ridx] < left_intervals[lidx].right:
+            elif right_sized[ridx] < cur.right:
                 ridx += 1
-            elif right_sized[ridx] == left_intervals[lidx].right:
-                left_intervals[lidx].including_right = True
+            elif right_sized[ridx] == cur.right:
+                if not cur.including_right:
+                    cur = cur._writable(mutable)
+                    cur.including_right = True
+                    left_intervals[lidx] = cur
                 ridx += 1
             else:
-                itvls.append(left_intervals[lidx])
+                itvls.append(cur)
                 lidx += 1
 
         # Extend and update with rest
-        sized.update(right_sized)
-        itvls.extend(left_intervals)
+        sized.update(right_sized[ridx:])
+        itvls.extend(left_intervals[lidx:])
 
         return sized, itvls
 
@@ -679,8 +914,8 @@ class Interval(Container):
     ) -> list:
         """
         Description:
-        Get the complement of `intervals` from universe intervals, (-inf, inf).
-        Here `intervals_diff_intervals` with `UNI_INTERVAL` will be called.
+        Get the complement of `intervals` from universe intervals, (-inf, inf),
+        by sweeping `UNI_INTERVAL` and `intervals` in one pass.
 
         Params:
         intervals
@@ -690,11 +925,12 @@ class Interval(Container):
         Return:
         [intervals, ]
         """
-        return cls.intervals_diff_intervals(
-            [UNI_INTERVAL.copy()],
+        if not trimmed:
+            intervals = cls.trim_intervals(intervals, mutable=mutable)
+        return _sweep_intervals(
+            [UNI_INTERVAL, ],
             intervals,
-            trimmed,
-            mutable
+            lambda in_uni, in_itvls: in_uni and not in_itvls
         )
 
 
@@ -707,8 +943,39 @@ class Interval(Container):
     ) -> list:
         """
         Description:
-        Calculate intersection between `left_intervals` and `right_intervals`.
-        Here complement and union will be used to achieve intersection.
+        Calculate intersection between `left_intervals` and `right_intervals`
+        by sweeping edges in one pass.
+
+        Params:
+        left_intervals
+        right_intervals
+        trimmed
+        mutable
+
+        Return:
+        [intervals, ]
+        """
+        if not trimmed:
+            left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
+            right_intervals = cls.trim_intervals(right_intervals, mutable=mutable)
+        return _sweep_intervals(
+            left_intervals,
+            right_intervals,
+            lambda in_left, in_right: in_left and in_right
+        )
+
+    @classmethod
+    def intervals_symdiff_intervals(cls,
+        left_intervals:Iterable,
+        right_intervals:Iterable,
+        trimmed:bool=False,
+        mutable:bool=False
+    ) -> list:
+        """
+        Description:
+        Calculate symmetric difference between `left_intervals` and
+        `right_intervals`, A.K.A. elements in only one of them, by sweeping
+        edges in one pass.
 
         Params:
         left_intervals
@@ -719,8 +986,14 @@ class Interval(Container):
         Return:
         [intervals, ]
         """
-        complemented = cls.complement_intervals(right_intervals, trimmed, mutable)
-        return cls.intervals_union_intervals(left_intervals, complemented, True, True)
+        if not trimmed:
+            left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
+            right_intervals = cls.trim_intervals(right_intervals, mutable=mutable)
+        return _sweep_intervals(
+            left_intervals,
+            right_intervals,
+            lambda in_left, in_right: in_left != in_right
+        )
 
     @classmethod
     def intervals_intersect_sized(cls,
@@ -731,8 +1004,8 @@ class Interval(Container):
     ) -> set:
         """
         Description:
-        Calculate intersection between `left_intervals` and `right_sized`.
-        Here difference will be used achieve intersection.
+        Calculate intersection between `left_intervals` and `right_sized`
+        by locating points in one pass.
 
         Params:
         left_intervals
@@ -743,10 +1016,41 @@ class Interval(Container):
         Return:
         {points, }
         """
-        # Don't change left and right if keep `trimmed`
-        return set(right_sized).difference(
-            cls.sized_diff_intervals(left_intervals, right_sized, trimmed, mutable)
-        )
+        if not trimmed:
+            left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
+            right_sized = sorted(right_sized)
+        locs = _locate_sized(left_intervals, right_sized)
+        return {ele for ele, loc in zip(right_sized, locs) if loc >= 0}
+
+    @classmethod
+    def intervals_symdiff_sized(cls,
+        left_intervals:Iterable,
+        right_sized:Sized,
+        trimmed:bool=False,
+        mutable:bool=False
+    ) -> Tuple[set, list]:
+        """
+        Description:
+        Calculate symmetric difference between `left_intervals` and
+        `right_sized` by locating points in one pass.
+        1. Points not in `left_intervals` are kept
+        2. Intervals are cut at points in them
+
+        Params:
+        left_intervals
+        right_sized
+        trimmed
+        mutable
+
+        Return:
+        {points, }, [intervals, ]
+        """
+        if not trimmed:
+            left_intervals = cls.trim_intervals(left_intervals, mutable=mutable)
+            right_sized = sorted(right_sized)
+        locs = _locate_sized(left_intervals, right_sized)
+        sized = {ele for ele, loc in zip(right_sized, locs) if loc < 0}
+        return sized, _cut_intervals(left_intervals, right_sized, locs)
 
     @classmethod
     def from_str(cls, str_:str) -> Interval:
@@ -780,7 +1084,7 @@ class Interval(Container):
             raise ValueError(f"Invalid parameter {str_}: interval must end with `)` or `]`")
 
         # Set edge
-        itvl.left, itvl.right = map(lambda edge: int(edge), str_[1:-1].split(","))
+        itvl.left, itvl.right = map(str2num, str_[1:-1].split(","))
 
         return itvl
 
@@ -788,16 +1092,17 @@ class Interval(Container):
     def from_single(cls, single:Union[int, float]) -> Interval:
         """
         Description:
-        Create interval containing only one 
+        Create interval containing only one point, or `NAN_INTERVAL` for
+        null point.
         """
-        if not single:
+        if single is None or single != single:
             return NAN_INTERVAL
         return cls(single, single, True, True)
 
     def copy(self):
         """
         Description:
-        Copy self
+        Copy self, and the copy is always mutable
         """
         copy_ = Interval(
             self.left,
@@ -807,6 +1112,45 @@ class Interval(Container):
         )
         return copy_
 
+    def lazy(self) -> LazyIntervals:
+        """
+        Description:
+        Wrap `self` as `LazyIntervals`, so that `+`, `-` and `&` with it
+        will be evaluated lazily.
+        """
+        return LazyIntervals.from_any(self)
+
+    def freeze(self) -> FrozenInterval:
+        """
+        Description:
+        Return frozen copy of `self`, or `self` if already frozen
+        """
+        if self.frozen:
+            return self
+        return FrozenInterval(
+            self.left,
+            self.right,
+            self.including_left,
+            self.including_right
+        )
+
+    def _writable(self, mutable:bool=False) -> Interval:
+        """
+        Description:
+        Copy on write: return `self` only when `self` could be altered
+        1. `mutable` and not frozen: `self`
+        2. else: a mutable copy of `self`
+
+        Params:
+        mutable: whether `self` could be altered
+
+        Return:
+        Interval
+        """
+        if mutable and not self.frozen:
+            return self
+        return self.copy()
+
     def overlaps(self, other:Any, adjoined=True) -> bool:
         """
         Descripion:
@@ -821,12 +1165,12 @@ class Interval(Container):
         """
         # Boundary cases
         # If `other` is null, return False directly
-        if not other:
+        if _is_empty(other):
             return False
 
         if (not self > other) and (not self < other):
             return True
-        elif issubclass(type(other), self.__class__) and adjoined:
+        elif issubclass(type(other), Interval) and adjoined:
             if (self.including_left or other.including_right) and \
                 self.left == other.right:
                 return True
@@ -928,10 +1272,231 @@ class Interval(Container):
 INF = float("inf")
 NINF = float("-inf")
 NAN = float("nan")
-UNI_INTERVAL = Interval(NINF, INF, False, False)
-MAX_INTERVAL = Interval(INF, INF, False, False)
-MIN_INTERVAL = Interval(NINF, NINF, False, False)
-NAN_INTERVAL = Interval(NAN, NAN, False, False)
+
+
+class FrozenInterval(Interval):
+    __slots__ = ()
+    frozen = True
+
+    def __init__(
+        self,
+        left:Union[int, float]=NAN,
+        right:Union[int, float]=NAN,
+        including_left:bool=True,
+        including_right:bool=False
+    ) -> None:
+        """
+        Description:
+        `Interval` which can't be altered, so it could be shared safely.
+        1. Altering edges, including calling `extend`, `remove`,
+           `set_with`, etc, will raise `AttributeError`
+        2. `copy` will return a mutable `Interval`
+        """
+        object.__setattr__(self, "left", left)
+        object.__setattr__(self, "right", right)
+        object.__setattr__(self, "including_left", including_left)
+        object.__setattr__(self, "including_right", including_right)
+
+    def __setattr__(self, name:str, value:Any) -> None:
+        raise AttributeError(f"can't set `{name}` of frozen interval {self!r}")
+
+
+UNI_INTERVAL = FrozenInterval(NINF, INF, False, False)
+MAX_INTERVAL = FrozenInterval(INF, INF, False, False)
+MIN_INTERVAL = FrozenInterval(NINF, NINF, False, False)
+NAN_INTERVAL = FrozenInterval(NAN, NAN, False, False)
+# %%
+class _SortedBlocks:
+    # Blocks will be split once they are longer than `2 * load`
+    load = 256
+
+    def __init__(self, items:Iterable=(), key:Callable=None) -> None:
+        """
+        Description:
+        Sorted list split into blocks with bounded length, so that
+        inserting or deleting items won't shift the whole list.
+        1. Locate the block with `bisect` over maximum keys of blocks, and
+           then locate the item with `bisect` in the block
+        2. Only the block located will be altered, which shifts at most
+           `2 * load` items
+
+        P.S.
+        Positions are pairs `(block index, index in block)`, which could
+        be compared as tuples, and the end is `(n_blocks, 0)`. Positions
+        are invalidated after `replace` or `insert`.
+
+        Params:
+        items: items sorted by `key` already
+        key: callable returning the key of each item, and items themselves
+            will be compared if not provided
+
+        Return:
+        """
+        self.key = key
+        items = list(items)
+        self.blocks = [items[idx: idx + self.load]
+            for idx in range(0, len(items), self.load)]
+        self.keys = [self.__keys_of(block) for block in self.blocks]
+        self.maxes = [keys[-1] for keys in self.keys]
+        self.size = len(items)
+
+    def __keys_of(self, items:list) -> list:
+        if self.key is None:
+            return list(items)
+        return [self.key(item) for item in items]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator:
+        for block in self.blocks:
+            yield from block
+
+    def tolist(self) -> list:
+        return [item for block in self.blocks for item in block]
+
+    def bisect_left(self, key:Any) -> Tuple[int, int]:
+        """
+        Description:
+        Return the position of the first item with key not less than `key`.
+        """
+        bidx = bisect_left(self.maxes, key)
+        if bidx == len(self.blocks):
+            return bidx, 0
+        return bidx, bisect_left(self.keys[bidx], key)
+
+    def bisect_right(self, key:Any) -> Tuple[int, int]:
+        """
+        Description:
+        Return the position of the first item with key greater than `key`.
+        """
+        bidx = bisect_right(self.maxes, key)
+        if bidx == len(self.blocks):
+            return bidx, 0
+        return bidx, bisect_right(self.keys[bidx], key)
+
+    def prev(self, pos:Tuple[int, int]) -> Union[Tuple[int, int], None]:
+        """
+        Description:
+        Return the position before `pos`, or None if `pos` is the start.
+        """
+        bidx, idx = pos
+        if idx > 0:
+            return bidx, idx - 1
+        if bidx > 0:
+            return bidx - 1, len(self.blocks[bidx - 1]) - 1
+        return None
+
+    def next(self, pos:Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Description:
+        Return the position after `pos`.
+        """
+        bidx, idx = pos
+        if idx + 1 < len(self.blocks[bidx]):
+            return bidx, idx + 1
+        return bidx + 1, 0
+
+    def at(self, pos:Union[Tuple[int, int], None]) -> Any:
+        """
+        Description:
+        Return the item at `pos`, or None if `pos` is None or the end.
+        """
+        if pos is None or pos[0] == len(self.blocks):
+            return None
+        return self.blocks[pos[0]][pos[1]]
+
+    def slice(self, lo:Tuple[int, int], hi:Tuple[int, int]) -> list:
+        """
+        Description:
+        Return items in `[lo, hi)`.
+        """
+        (lbidx, lidx), (hbidx, hidx) = lo, hi
+        if lbidx == hbidx:
+            return self.blocks[lbidx][lidx: hidx] if lbidx < len(self.blocks) else []
+        items = self.blocks[lbidx][lidx:]
+        for bidx in range(lbidx + 1, hbidx):
+            items.extend(self.blocks[bidx])
+        if hbidx < len(self.blocks):
+            items.extend(self.blocks[hbidx][:hidx])
+        return items
+
+    def replace(self, lo:Tuple[int, int], hi:Tuple[int, int], items:list) -> None:
+        """
+        Description:
+        Replace items in `[lo, hi)` with `items`, which should be sorted
+        and fit in `[lo, hi)` in order.
+        1. Items in `[lo, hi)` in the block of `lo` are replaced
+        2. Blocks between `lo` and `hi` are deleted, and items before `hi`
+           in the block of `hi` are deleted
+        3. Blocks altered will be deleted if empty, or split if too long
+        """
+        if not self.blocks:
+            if items:
+                self.blocks, self.keys = [list(items)], [self.__keys_of(items)]
+                self.maxes = [self.keys[0][-1]]
+                self.size = len(items)
+                self.__split(0)
+            return
+        # Append to the last block if `lo` is the end
+        if lo[0] == len(self.blocks):
+            lo = hi = (len(self.blocks) - 1, len(self.blocks[-1]))
+        (lbidx, lidx), (hbidx, hidx) = lo, hi
+        removed = len(self.slice(lo, hi))
+        if lbidx == hbidx:
+            self.blocks[lbidx][lidx: hidx] = items
+            self.keys[lbidx][lidx: hidx] = self.__keys_of(items)
+        else:
+            self.blocks[lbidx][lidx:] = items
+            self.keys[lbidx][lidx:] = self.__keys_of(items)
+            if hbidx < len(self.blocks):
+                del self.blocks[hbidx][:hidx]
+                del self.keys[hbidx][:hidx]
+            del self.blocks[lbidx + 1: hbidx]
+            del self.keys[lbidx + 1: hbidx]
+            del self.maxes[lbidx + 1: hbidx]
+            if lbidx + 1 < len(self.blocks):
+                self.__fix(lbidx + 1)
+        self.size += len(items) - removed
+        self.__fix(lbidx)
+
+    def insert(self, item:Any) -> None:
+        """
+        Description:
+        Insert `item` in order.
+        """
+        key = item if self.key is None else self.key(item)
+        pos = self.bisect_right(key)
+        self.replace(pos, pos, [item, ])
+
+    def __fix(self, bidx:int) -> None:
+        """
+        Description:
+        Delete block `bidx` if empty, or update its maximum and split it
+        if too long.
+        """
+        if not self.blocks[bidx]:
+            del self.blocks[bidx]
+            del self.keys[bidx]
+            del self.maxes[bidx]
+            return
+        self.maxes[bidx] = self.keys[bidx][-1]
+        self.__split(bidx)
+
+    def __split(self, bidx:int) -> None:
+        """
+        Description:
+        Split block `bidx` into halves if it's longer than `2 * load`.
+        """
+        block, keys = self.blocks[bidx], self.keys[bidx]
+        if len(block) <= 2 * self.load:
+            return
+        half = len(block) // 2
+        self.blocks[bidx: bidx + 1] = [block[:half], block[half:]]
+        self.keys[bidx: bidx + 1] = [keys[:half], keys[half:]]
+        self.maxes[bidx: bidx + 1] = [keys[half - 1], keys[-1]]
+
+
 # %%
 class Value(Iterable):
     def __init__(
@@ -952,16 +1517,32 @@ class Value(Iterable):
         trimmed: if elements in `value` are trimmed
         mutable: if elements in `value` are mutable, for intervals especially
         """
-        value = flatten_iterable(value)
-        intervals, sized = separate_container(value)
+        intervals, sized = partition_container(iter_flatten(value))
         sized, intervals = Interval.intervals_union_sized(
             intervals,
-            size,
+            sized.tolist() if trimmed else _sorted_sized(sized),
             trimmed,
             mutable
         )
         self.intervals = intervals
         self.sized = sized
+        # Sorted points maintained for bisect in `add_XXX`, `discard_XXX`,
+        # which will be rebuilt once `sized` is replaced
+        self._pblocks, self._pblocks_of = None, None
+
+    @property
+    def intervals(self) -> Union[list, IntervalSet]:
+        # Intervals altered by `add_XXX`, `discard_XXX` are kept in blocks,
+        # and the list will be rebuilt only when read
+        if self._iblocks_dirty:
+            self._intervals = self._iblocks.tolist()
+            self._iblocks_dirty = False
+        return self._intervals
+
+    @intervals.setter
+    def intervals(self, intervals:Union[list, IntervalSet]) -> None:
+        self._intervals = intervals
+        self._iblocks, self._iblocks_dirty = None, False
 
     def __contains__(self, item:Any, closed:bool=False) -> bool:
         # Use flag to record if every elements in `item` is contained
@@ -983,12 +1564,37 @@ class Value(Iterable):
                     break
         return if_contained
 
-    def __iter__(self) -> Iterator:
+    def contains_array(self, values:Iterable) -> np.ndarray:
         """
         Description:
-        `self.sized` and each intervals in `self.intervals` will be
-        yield in order.
-        """
+        Vectorized `__contains__` for each element in `values`.
+        1. Points in `self.sized` are checked with `np.isin`, and `nan`
+           will be contained if `self.sized` contains `nan`
+        2. Intervals are checked with `IntervalSet.contains_array`
+
+        Params:
+        values: array-like of numbers
+
+        Return:
+        bool array with the same shape of `values`
+        """
+        values = np.asarray(values, dtype=float)
+        if issubclass(type(self.intervals), IntervalSet):
+            itvls = self.intervals
+        else:
+            itvls = IntervalSet.from_intervals(self.intervals)
+        points = np.fromiter(self.sized, dtype=float, count=len(self.sized))
+        contained = itvls.contains_array(values) | np.isin(values, points)
+        if np.isnan(points).any():
+            contained |= np.isnan(values)
+        return contained
+
+    def __iter__(self) -> Iterator:
+        """
+        Description:
+        `self.sized` and each intervals in `self.intervals` will be
+        yield in order.
+        """
         yield self.sized
         yield from self.intervals
 
@@ -1024,53 +1630,70 @@ class Value(Iterable):
         return (self in other) and (other in self)
 
     def __add__(self, other:Any, mutable:bool=False) -> Value:
+        # `Other`: LazyIntervals -> build expression lazily
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() + other
+
+        # Columnar storage: delegate to vectorized sweeps of `IntervalSet`
+        if issubclass(type(self.intervals), IntervalSet):
+            return self.__class__.from_interval_set(self.to_interval_set() + other)
+
         # Copy `self` if not mutable
+        # P.S.
+        # Intervals are frozen and shared by the copy, and will be copied
+        # on write in `Interval`'s methods
         if not mutable:
-            self_copy = self.copy
+            self_copy = self.copy()
         else:
             self_copy = self
 
         if issubclass(type(other), Iterable):
             # Seperate and sort intervals and sized
-            other = flatten_iterable(other)
-            itvls, sized = separate_container(other)
-            self_copy.sized.update(sized)
+            itvls, sized = partition_container(iter_flatten(other))
+            self_copy.sized.update(sized.tolist())
             sized = sorted(self_copy.sized)
             itvls = Interval.trim_intervals(itvls, mutable=mutable)
             itvls = Interval.merge_intervals(
                 self_copy.intervals,
                 itvls,
-                mutable=True
+                mutable=mutable
             )
         else:
             if issubclass(type(other), Interval):
                 # P.S.
                 # Here `.merge_intervals` works like ordering insertation,
                 #  and some insertation can be more efficient, but lazyness.
-                other = other if mutable else other.copy()
                 itvls = Interval.merge_intervals(
                     self_copy.intervals,
                     [other],
-                    mutable=True
+                    mutable=mutable
                 )
-                sized = self_copy.sized
+                sized = sorted(self_copy.sized)
             else:
                 itvls = self_copy.intervals
-                self.sized.add(other)
-                sized = self.sized
+                self_copy.sized.add(other)
+                sized = sorted(self_copy.sized)
 
         # Trim intervals with sized
         sized, intervals = Interval.intervals_union_sized(
             itvls,
             sized,
             True,
-            True
+            mutable
         )
 
         self_copy.sized, self_copy.intervals = sized, intervals
         return self_copy
 
     def __sub__(self, other:Any, mutable:bool=False) -> Value:
+        # `Other`: LazyIntervals -> build expression lazily
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() - other
+
+        # Columnar storage: delegate to vectorized sweeps of `IntervalSet`
+        if issubclass(type(self.intervals), IntervalSet):
+            return self.__class__.from_interval_set(self.to_interval_set() - other)
+
         # Copy `self` if not mutable
         if not mutable:
             self_copy = self.copy()
@@ -1079,45 +1702,49 @@ class Value(Iterable):
 
         if issubclass(type(other), Iterable):
             # Seperate and sort intervals and sized
-            other = flatten_iterable(other)
-            itvls, sized = separate_container(other)
-            sized = sorted(sized)
+            itvls, sized = partition_container(iter_flatten(other))
+            sized = _sorted_sized(sized)
             itvls = Interval.trim_intervals(itvls, mutable=mutable)
             self_copy.sized = self_copy.sized.difference(sized)
-            self_copy.sized = Interval.sized_diff_intervals(
+            self_copy.sized = set(Interval.sized_diff_intervals(
                 sorted(self_copy.sized),
                 itvls,
                 True,
-                True
-            )
-            self_copy.intervals = Interval.intervals_union_sized(
+                mutable
+            ))
+            self_copy.intervals = Interval.intervals_diff_intervals(
                 self_copy.intervals,
                 itvls,
                 True,
-                True
+                mutable
+            )
+            self_copy.intervals = Interval.intervals_diff_sized(
+                self_copy.intervals,
+                sized,
+                True,
+                mutable
             )
         else:
             if issubclass(type(other), Interval):
-                other = other if mutable else other.copy()
-                self_copy.sized = Interval.sized_diff_intervals(
+                self_copy.sized = set(Interval.sized_diff_intervals(
                     sorted(self_copy.sized),
                     [other, ],
                     True,
-                    True
-                )
+                    mutable
+                ))
                 self_copy.intervals = Interval.intervals_diff_intervals(
                     self_copy.intervals,
                     [other, ],
                     True,
-                    True
+                    mutable
                 )
             else:
-                self_copy.sized = self_copy.sized.difference(other)
+                self_copy.sized = self_copy.sized.difference([other, ])
                 self_copy.intervals = Interval.intervals_diff_sized(
                     self_copy.intervals,
                     [other, ],
                     True,
-                    True
+                    mutable
                 )
 
         return self_copy
@@ -1127,12 +1754,36 @@ class Value(Iterable):
         """
         Description:
         Return a copy of self.
+
+        P.S.
+        Intervals in `self` are frozen in place once, and then shared with
+        the copy without being copied, while both of them will copy the
+        intervals on write in `Value`'s methods.
         """
+        if issubclass(type(self.intervals), IntervalSet):
+            return self.__class__.from_raw(self.sized.copy(), self.intervals.copy())
         return self.__class__.from_raw(
             self.sized.copy(),
-            [itvl.copy() for itvl in self.intervals]
+            self.__share_intervals()
         )
 
+    def __share_intervals(self) -> list:
+        """
+        Description:
+        Freeze intervals in `self` in place, so that they could be shared
+        with other `Value` safely.
+        1. Intervals are frozen only if some of them are still mutable, so
+           copying a `Value` again won't allocate any interval
+        2. Each `Value` owns its list, which is altered in place in
+           `add_XXX`, `discard_XXX`
+
+        Return:
+        [FrozenInterval, ] shared with `self`
+        """
+        if not all(itvl.frozen for itvl in self.intervals):
+            self.intervals = [itvl.freeze() for itvl in self.intervals]
+        return list(self.intervals)
+
     def set_with(self, other:Value) -> None:
         """
         Description:
@@ -1144,11 +1795,294 @@ class Value(Iterable):
         Return:
         """
         self.sized = other.sized.copy()
-        self.intervals = [itvl.copy() for itvl in other.intervals]
+        if issubclass(type(other.intervals), IntervalSet):
+            self.intervals = other.intervals.copy()
+        else:
+            self.intervals = other.__share_intervals()
+
+    def lazy(self) -> LazyIntervals:
+        """
+        Description:
+        Wrap `self` as `LazyIntervals`, so that `+`, `-` and `&` with it
+        will be evaluated lazily.
+        """
+        return LazyIntervals.from_any(self)
+
+    def to_interval_set(self) -> IntervalSet:
+        """
+        Description:
+        Convert `self` into `IntervalSet`, in which points in `self.sized`
+        will be represented as closed intervals with same edges.
+
+        Return:
+        IntervalSet
+        """
+        if issubclass(type(self.intervals), IntervalSet):
+            return self.intervals + self.intervals.from_points(self.sized)
+        return IntervalSet.from_intervals(self.intervals) \
+            + IntervalSet.from_points(self.sized)
+
+    def to_bytes(self) -> bytes:
+        """
+        Description:
+        Serialize `self` into compact bytes: edge arrays, closedness bitmaps
+        and point array, which is much smaller and faster to load than
+        pickled `Interval`s.
+
+        P.S.
+        Only numeric points are supported.
+
+        Return:
+        bytes
+        """
+        iset = IntervalSet.from_any(self.intervals)
+        try:
+            points = np.array(sorted(self.sized), dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("only numeric points could be serialized")
+        return _pack_intervals(
+            iset.left,
+            iset.right,
+            iset.including_left,
+            iset.including_right,
+            points
+        )
+
+    def save(self, path:str) -> None:
+        """
+        Description:
+        Save `self` into file `path`, which could be loaded by `load`.
+        """
+        with open(path, "wb") as fp:
+            fp.write(self.to_bytes())
 
     def overlaps(self, other: Any):
         pass
 
+    def __interval_blocks(self) -> _SortedBlocks:
+        """
+        Description:
+        Return `self.intervals` in blocks keyed by left edges, which will
+        be rebuilt only if `self.intervals` has been replaced.
+        """
+        if self._iblocks is None:
+            self._iblocks = _SortedBlocks(self._intervals, key=attrgetter("left"))
+        return self._iblocks
+
+    def __point_blocks(self) -> _SortedBlocks:
+        """
+        Description:
+        Return points in `self.sized` in blocks, which will be rebuilt only
+        if `self.sized` has been replaced.
+        """
+        if self._pblocks_of is not self.sized:
+            self._pblocks = _SortedBlocks(
+                sorted([ele for ele in self.sized if ele == ele]))
+            self._pblocks_of = self.sized
+        return self._pblocks
+
+    def __update_with(self, other:Value) -> None:
+        """
+        Description:
+        Replace storage of `self` with `other`'s, for `IntervalSet` storage.
+        """
+        self.sized, self.intervals = other.sized, other.intervals
+
+    def add_point(self, point:Union[int, float]) -> None:
+        """
+        Description:
+        Add `point` into `self` in place, with bisect on sorted edges.
+        1. `point` touches intervals: merge it with intervals by
+           `add_interval`
+        2. Else: add `point` into `self.sized`
+
+        P.S.
+        1. `IntervalSet` storage will fall back to vectorized `__add__`.
+        2. Bisect takes O(log n), and inserting shifts at most one block
+           of the sorted points.
+
+        Params:
+        point
+
+        Return:
+        """
+        # Check the storage without rebuilding the list from blocks
+        if issubclass(type(self._intervals), IntervalSet):
+            return self.__update_with(self + [point, ])
+        # `nan` can't be compared, so just add it into `self.sized`
+        if point != point:
+            self.sized.add(point)
+            return
+
+        iblocks = self.__interval_blocks()
+        pos = iblocks.bisect_right(point)
+        before, after = iblocks.at(iblocks.prev(pos)), iblocks.at(pos)
+        if (before is not None and point <= before.right) or \
+            (after is not None and point == after.left):
+            self.add_interval(Interval(point, point, True, True))
+        elif point not in self.sized:
+            pblocks = self.__point_blocks()
+            self.sized.add(point)
+            pblocks.insert(point)
+
+    def add_interval(self, interval:Interval) -> None:
+        """
+        Description:
+        Add `interval` into `self` in place, and only intervals and points
+        affected will be merged.
+        1. Include open edges of `interval` if they are in `self.sized`
+        2. Bisect to find intervals overlapping or adjoined with `interval`
+        3. Replace these intervals with the merged one
+        4. Remove points contained in the merged interval
+
+        P.S.
+        1. `IntervalSet` storage will fall back to vectorized `__add__`.
+        2. Searching takes O(log n) and merging O(k) for k intervals and
+           points affected, and replacing them shifts at most one block, so
+           the update is O(log n + k) amortized. `self.intervals` will be
+           rebuilt in O(n) when read after updates.
+
+        Params:
+        interval
+
+        Return:
+        """
+        if issubclass(type(self._intervals), IntervalSet):
+            return self.__update_with(self + [interval, ])
+        if not interval:
+            return
+
+        iblocks, pblocks = self.__interval_blocks(), self.__point_blocks()
+        merged = interval.copy()
+        if not merged.including_left and merged.left in self.sized:
+            merged.including_left = True
+        if not merged.including_right and merged.right in self.sized:
+            merged.including_right = True
+
+        # Intervals in `[lo, hi)` overlap or adjoin with `merged`
+        lo = iblocks.bisect_left(merged.left)
+        before = iblocks.prev(lo)
+        if before is not None and iblocks.at(before).overlaps(merged):
+            lo = before
+        hi = iblocks.bisect_right(merged.right)
+        if hi > lo and not iblocks.at(iblocks.prev(hi)).overlaps(merged):
+            hi = iblocks.prev(hi)
+        for itvl in iblocks.slice(lo, hi):
+            merged.extend(itvl)
+
+        # Remove points contained in `merged`
+        plo = pblocks.bisect_left(merged.left)
+        phi = pblocks.bisect_right(merged.right)
+        self.sized.difference_update(pblocks.slice(plo, phi))
+        pblocks.replace(plo, phi, [])
+
+        # Keep single point in `self.sized`, and intervals merged, single
+        # point intervals for example, should be removed still
+        if merged.left == merged.right:
+            iblocks.replace(lo, hi, [])
+            self.sized.add(merged.left)
+            pblocks.insert(merged.left)
+        else:
+            iblocks.replace(lo, hi, [merged, ])
+        self._iblocks_dirty = True
+
+    def discard_point(self, point:Union[int, float]) -> None:
+        """
+        Description:
+        Remove `point` from `self` in place, with bisect on sorted edges.
+        1. `point` in `self.sized`: remove it from `self.sized`
+        2. `point` in interval: split the interval at `point`
+
+        P.S.
+        1. `IntervalSet` storage will fall back to vectorized `__sub__`.
+        2. Bisect takes O(log n), and deleting or splitting shifts at most
+           one block.
+
+        Params:
+        point
+
+        Return:
+        """
+        if issubclass(type(self._intervals), IntervalSet):
+            return self.__update_with(self - [point, ])
+        if point in self.sized:
+            pblocks = self.__point_blocks()
+            self.sized.discard(point)
+            if point == point:
+                pos = pblocks.bisect_left(point)
+                pblocks.replace(pos, pblocks.next(pos), [])
+            return
+        if point != point:
+            return
+
+        iblocks = self.__interval_blocks()
+        pos = iblocks.prev(iblocks.bisect_right(point))
+        cur = iblocks.at(pos)
+        if cur is None or not cur.contains_array(point):
+            return
+        splited = [itvl for itvl in (
+            Interval(cur.left, point, cur.including_left, False),
+            Interval(point, cur.right, False, cur.including_right)
+        ) if itvl]
+        iblocks.replace(pos, iblocks.next(pos), splited)
+        self._iblocks_dirty = True
+
+    def discard_interval(self, interval:Interval) -> None:
+        """
+        Description:
+        Remove `interval` from `self` in place, and only intervals and
+        points affected will be altered.
+        1. Remove points contained in `interval`
+        2. Bisect to find intervals overlapping with `interval`, and
+           replace them with `intervals_diff_intervals`
+
+        P.S.
+        1. `IntervalSet` storage will fall back to vectorized `__sub__`.
+        2. O(log n + k) comparisons for k intervals and points affected,
+           and shifting of at most one block, amortized.
+
+        Params:
+        interval
+
+        Return:
+        """
+        if issubclass(type(self._intervals), IntervalSet):
+            return self.__update_with(self - [interval, ])
+        if not interval:
+            return
+
+        iblocks, pblocks = self.__interval_blocks(), self.__point_blocks()
+
+        # Remove points contained in `interval`
+        plo = pblocks.bisect_left(interval.left)
+        phi = pblocks.bisect_right(interval.right)
+        points = pblocks.slice(plo, phi)
+        contained = interval.contains_array(points)
+        self.sized.difference_update(
+            [pt for pt, in_ in zip(points, contained) if in_])
+        pblocks.replace(plo, phi,
+            [pt for pt, in_ in zip(points, contained) if not in_])
+
+        # Intervals in `[lo, hi)` may overlap with `interval`
+        lo = iblocks.bisect_right(interval.left)
+        lo = iblocks.prev(lo) or lo
+        hi = iblocks.bisect_right(interval.right)
+        remained = Interval.intervals_diff_intervals(
+            iblocks.slice(lo, hi),
+            [interval, ],
+            trimmed=True
+        )
+        # Single points remained will be kept in `self.sized`
+        splited = []
+        for itvl in remained:
+            if itvl.left == itvl.right:
+                self.sized.add(itvl.left)
+                pblocks.insert(itvl.left)
+            else:
+                splited.append(itvl)
+        iblocks.replace(lo, hi, splited)
+        self._iblocks_dirty = True
+
     @classmethod
     def from_raw(cls, sized:set, intervals:list) -> Value:
         """
@@ -1169,6 +2103,85 @@ class Value(Iterable):
         inst.intervals = intervals
         return inst
 
+    @classmethod
+    def union_many(cls, values:Iterable) -> Value:
+        """
+        Description:
+        Join all `values` with one k-way sweep.
+        1. Intervals: `Interval.union_many` or `IntervalSet.union` if any
+           `Value` is stored with `IntervalSet`
+        2. Points: join all points and trim them with intervals
+
+        Params:
+        values: [Value, ], or [[int, float, Interval, etc], ]
+
+        Return:
+        Value
+        """
+        values = [val if issubclass(type(val), Value) else cls(val)
+            for val in values]
+        if not values:
+            return cls()
+
+        if any(issubclass(type(val.intervals), IntervalSet) for val in values):
+            isets = [val.to_interval_set() for val in values]
+            return cls.from_interval_set(isets[0].union(*isets[1:]))
+
+        intervals = Interval.union_many(
+            [val.intervals for val in values],
+            trimmed=True
+        )
+        sized, intervals = Interval.intervals_union_sized(
+            intervals,
+            sorted(set().union(*[val.sized for val in values])),
+            True
+        )
+        return cls.from_raw(sized, intervals)
+
+    @classmethod
+    def from_interval_set(cls, iset:IntervalSet) -> Value:
+        """
+        Description:
+        Create `Value` with `IntervalSet` as storage of intervals, so that
+        `__add__`, `__sub__` will be delegated to vectorized sweeps.
+        1. Closed intervals with same edges will be regarded as points
+
+        Params:
+        iset
+
+        Return:
+        Value
+        """
+        is_point = iset.left == iset.right
+        return cls.from_raw({itvl.left for itvl in iset[is_point]}, iset[~is_point])
+
+    @classmethod
+    def from_bytes(cls, buf:Any) -> Value:
+        """
+        Description:
+        Create `Value` from bytes returned by `to_bytes`, with intervals
+        stored as `IntervalSet` sharing memory with `buf`.
+
+        Params:
+        buf: bytes, memoryview, `np.memmap`, etc
+
+        Return:
+        Value
+        """
+        left, right, including_left, including_right, points = _unpack_intervals(buf)
+        return cls.from_raw(
+            set(points.tolist()),
+            IntervalSet.from_raw(left, right, including_left, including_right)
+        )
+
+    @classmethod
+    def load(cls, path:str) -> Value:
+        """
+        Description:
+        Load `Value` saved by `save` with `np.memmap`.
+        """
+        return cls.from_bytes(np.memmap(path, dtype=np.uint8, mode="r"))
+
     @classmethod
     def from_str(cls, str_:str) -> Value:
         """
@@ -1176,28 +2189,2258 @@ class Value(Iterable):
         Construct `Value` from string.
 
         Params:
-        str_: with format like that: "{{}, (left, right],...}"
+        str_: with format like that: "{point,...,(left, right],...}", which
+            is the same as `repr`, and points could also be enclosed with
+            `{}` like "{{point,...}, (left, right],...}"
 
         Return:
         """
-        str_ = str_.repalce(" ", "")[1:-1]
-        sized_str, itvls_str = str_.split("},")
-        sized_str = sized[1:].split(",")
-        sized_idx = 0
-        for sized_idx in range(len(sized_str)):
-            if re.fullmatch("[+-]?\d+", sized_str[sized_idx]):
-                sized_str[sized_idx] = int(sized_str[sized_idx])
+        sized, itvls = set(), []
+        for token in VALUE_TOKEN_REGEX.findall(str_):
+            if not token.strip():
+                continue
+            if token[0] in "[(":
+                itvls.append(Interval.from_str(token))
             else:
-                sized_str[sized_idx] = float(sized_str[sized_idx])
-        itvls, itvl_idx = [], 0
-        itvls_str = itvls_str.split(",")
-        while itvl_idx < len(itvls_str):
-            itvls.append(Interval.from_str(f"{itvls_str[itvl_idx]},{itvls_str[itvl_idx+1]}"))
-            itvl_idx += 2
-        return Value.from_raw(
-            set(sized),
-            itvls
+                sized.add(str2num(token))
+        return cls.from_raw(sized, itvls)
+# %%
+def _edge_keys(
+    left:np.ndarray,
+    right:np.ndarray,
+    including_left:np.ndarray,
+    including_right:np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Description:
+    Convert edges into keys, with which each interval could be regarded
+    as half-open `[start, end)` without losing any float
+    1. including-left: `start` = `left`
+    2. not including-left: `start` = next float after `left`
+    3. including-right: `end` = next float after `right`
+    4. not including-right: `end` = `right`
+
+    P.S.
+    Unlike `MINPAD`, next float won't be swallowed by large magnitude,
+    so no element will be lost or added.
+
+    Params:
+    left
+    right
+    including_left
+    including_right
+
+    Return:
+    start, end
+    """
+    start = np.where(including_left, left, np.nextafter(left, INF))
+    end = np.where(including_right, np.nextafter(right, INF), right)
+    return start, end
+
+
+def _sweep_edges(operands:list) -> Union[Tuple[np.ndarray, ...], None]:
+    """
+    Description:
+    Sort all edges of `operands` together as half-open keys from
+    `IntervalSet.keys`, which is shared by `_sweep` and
+    `LazyIntervals.evaluate`.
+
+    Params:
+    operands: [IntervalSet, ] of the same class, which need not be trimmed
+
+    Return:
+    None if there is no valid interval, else
+    uidx: index of unique key for each edge
+    opids: index of operand for each edge
+    deltas: 1 for start edges and -1 for end edges
+    edges: edges sorted by keys
+    shifted: if each edge is shifted, A.K.A. open left or closed right
+    is_new: if each edge begins a new unique key
+    """
+    keys, edges, shifted, opids, deltas = [], [], [], [], []
+    for opid, iset in enumerate(operands):
+        start, end = iset.keys()
+        # Drop null intervals, nan edges included
+        valid = start < end
+        n = np.count_nonzero(valid)
+        keys.extend([start[valid], end[valid]])
+        edges.extend([iset.left[valid], iset.right[valid]])
+        shifted.extend([~iset.including_left[valid], iset.including_right[valid]])
+        opids.append(np.full(2 * n, opid, dtype=np.int64))
+        deltas.extend([np.ones(n, dtype=np.int64), -np.ones(n, dtype=np.int64)])
+
+    keys = np.concatenate(keys)
+    if len(keys) == 0:
+        return None
+
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+
+    # Unique keys, and index of unique key for each edge
+    is_new = np.empty(len(keys), dtype=bool)
+    is_new[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=is_new[1:])
+    uidx = np.cumsum(is_new) - 1
+    return (uidx, np.concatenate(opids)[order], np.concatenate(deltas)[order],
+        np.concatenate(edges)[order], np.concatenate(shifted)[order], is_new)
+
+
+def _sweep_spans(
+    kept:np.ndarray,
+    edges:np.ndarray,
+    shifted:np.ndarray,
+    is_new:np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Description:
+    Concatenate spans between adjacent unique keys kept into intervals.
+    Spans kept begin where `kept` turns on, and end where turns off.
+
+    Return:
+    left, right, including_left, including_right
+    """
+    prev = np.empty(len(kept), dtype=bool)
+    prev[0] = False
+    prev[1:] = kept[:-1]
+    turn_on, turn_off = kept & ~prev, prev & ~kept
+    uedges, ushifted = edges[is_new], shifted[is_new]
+    return (uedges[turn_on], uedges[turn_off],
+        ~ushifted[turn_on], ushifted[turn_off])
+
+
+def _sweep(
+    operands:list,
+    predicate:Callable,
+    per_operand:bool=False
+) -> Tuple[np.ndarray, ...]:
+    """
+    Description:
+    Sweep all edges of `operands` once, and keep the spans where
+    `predicate` holds.
+    1. Convert edges into half-open keys with `IntervalSet.keys` and
+       sort them together
+    2. Count coverage between each two adjacent keys, summed over all
+       operands, or of each operand only if `per_operand` is set
+    3. Apply `predicate` on coverage and concatenate spans kept
+
+    P.S.
+    1. Each key remembers the edge and closedness where it comes from, so
+       the edges returned are always copied from `operands` instead of
+       being calculated from keys.
+    2. Summed coverage takes memory linear to the number of edges, while
+       coverage per operand takes memory of `n_keys * n_operands`, which
+       should be used only for operations like difference. Since
+       `IntervalSet` is always trimmed, union of operands is summed
+       coverage `> 0` and intersection of `k` operands is `== k`.
+
+    Params:
+    operands: [IntervalSet, ] of the same class, which need not be trimmed
+    predicate: callable accepting coverage and returning bool array with
+        shape (n_keys, ) indicating which spans to be kept, which must
+        return False if no operand covers the span.
+        1. Summed: int array with shape (n_keys, ) counting intervals
+           covering the spans
+        2. Per operand: bool array with shape (n_keys, n_operands)
+           indicating if each operand covers the spans
+    per_operand: if to pass coverage of each operand to `predicate`
+
+    Return:
+    left, right, including_left, including_right
+    """
+    swept = _sweep_edges(operands)
+    if swept is None:
+        dtype = operands[0].left.dtype
+        return (np.empty(0, dtype=dtype), np.empty(0, dtype=dtype),
+            np.empty(0, dtype=bool), np.empty(0, dtype=bool))
+    uidx, opids, deltas, edges, shifted, is_new = swept
+    n_keys = int(uidx[-1]) + 1
+
+    # Coverage in span `[key_i, key_i+1)`
+    if per_operand:
+        n_ops = len(operands)
+        coverage = np.bincount(
+            uidx * n_ops + opids,
+            weights=deltas,
+            minlength=n_keys * n_ops
+        ).reshape(n_keys, n_ops).cumsum(axis=0) > 0
+    else:
+        coverage = np.bincount(uidx, weights=deltas, minlength=n_keys) \
+            .cumsum().astype(np.int64)
+    return _sweep_spans(predicate(coverage), edges, shifted, is_new)
+
+
+def _bitmap_size(n:int) -> int:
+    return (n + 63) // 64 * 8
+
+
+def _pack_intervals(
+    left:np.ndarray,
+    right:np.ndarray,
+    including_left:np.ndarray,
+    including_right:np.ndarray,
+    points:np.ndarray=None,
+    magic:bytes=BYTES_MAGIC
+) -> bytes:
+    """
+    Description:
+    Pack edges, closedness and points into bytes with layout described
+    by `BYTES_MAGIC`, and edges will be stored as int64 codes if `magic`
+    is `BYTES_CODES_MAGIC`.
+    """
+    edge_dtype = "<i8" if magic == BYTES_CODES_MAGIC else "<f8"
+    points = np.empty(0) if points is None else points
+    n, m = len(left), len(points)
+    bsize = _bitmap_size(n)
+    chunks = [
+        magic,
+        np.array([n, m], dtype="<i8").tobytes(),
+        np.asarray(left, dtype=edge_dtype).tobytes(),
+        np.asarray(right, dtype=edge_dtype).tobytes(),
+    ]
+    for flags in (including_left, including_right):
+        bitmap = np.packbits(np.asarray(flags, dtype=bool), bitorder="little")
+        chunks.append(bitmap.tobytes().ljust(bsize, b"\0"))
+    chunks.append(np.asarray(points, dtype="<f8").tobytes())
+    return b"".join(chunks)
+
+
+def _unpack_intervals(buf:Any, magic:bytes=BYTES_MAGIC) -> Tuple[np.ndarray, ...]:
+    """
+    Description:
+    Unpack bytes or `np.memmap` packed by `_pack_intervals` with `magic`.
+    1. Edge and point arrays are views of `buf` with `np.frombuffer`, so
+       no copy happens and they are read-only
+    2. Bitmaps are unpacked into bool arrays
+
+    Return:
+    left, right, including_left, including_right, points
+    """
+    if bytes(buf[:8]) != magic:
+        raise ValueError("invalid bytes for intervals")
+    edge_dtype = "<i8" if magic == BYTES_CODES_MAGIC else "<f8"
+    n, m = np.frombuffer(buf, dtype="<i8", count=2, offset=8).tolist()
+    bsize = _bitmap_size(n)
+    offset = BYTES_HEADER
+    left = np.frombuffer(buf, dtype=edge_dtype, count=n, offset=offset)
+    offset += 8 * n
+    right = np.frombuffer(buf, dtype=edge_dtype, count=n, offset=offset)
+    offset += 8 * n
+    flags = []
+    for _ in range(2):
+        bitmap = np.frombuffer(buf, dtype=np.uint8, count=bsize, offset=offset)
+        flags.append(np.unpackbits(bitmap, count=n, bitorder="little").astype(bool))
+        offset += bsize
+    points = np.frombuffer(buf, dtype="<f8", count=m, offset=offset)
+    return left, right, flags[0], flags[1], points
+
+
+# %%
+class IntervalSet(Sized, Iterable):
+    # Dtype of `left` and `right`
+    dtype = float
+
+    def __init__(
+        self,
+        left:Iterable=(),
+        right:Iterable=(),
+        including_left:Union[bool, Iterable]=True,
+        including_right:Union[bool, Iterable]=False,
+        trimmed:bool=False
+    ) -> None:
+        """
+        Description:
+        Columnar set of intervals, which is always sorted and trimmed.
+        1. Edges are stored in float arrays `left`, `right`
+        2. Closedness are stored in bool arrays `including_left`,
+           `including_right`
+        3. Points are stored as closed intervals with same edges
+        And union, difference, intersection and complement are all
+        vectorized sweeps over the arrays, instead of loops over `Interval`.
+
+        Params:
+        left: left edges
+        right: right edges
+        including_left: bool or bools for each interval
+        including_right: bool or bools for each interval
+        trimmed: if intervals are already sorted and trimmed
+
+        Return:
+        """
+        self.left = np.asarray(left, dtype=self.dtype).ravel()
+        self.right = np.asarray(right, dtype=self.dtype).ravel()
+        self.including_left = self.__as_flags(including_left)
+        self.including_right = self.__as_flags(including_right)
+        if not trimmed and len(self.left):
+            self.left, self.right, self.including_left, self.including_right = \
+                _sweep([self], lambda cov: cov > 0)
+
+    def __as_flags(self, flags:Union[bool, Iterable]) -> np.ndarray:
+        """
+        Description:
+        Broadcast closedness to bool array with the same length of edges
+        """
+        flags = np.asarray(flags, dtype=bool).ravel()
+        if flags.size == 1:
+            return np.full(len(self.left), flags[0], dtype=bool)
+        return flags
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+    def __bool__(self) -> bool:
+        return len(self.left) > 0
+
+    def keys(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description:
+        Return half-open keys `[start, end)` of intervals, which will be
+        sorted and compared in `_sweep`.
+        """
+        return _edge_keys(
+            self.left,
+            self.right,
+            self.including_left,
+            self.including_right
+        )
+
+    def edges(self) -> Tuple[np.ndarray, ...]:
+        """
+        Description:
+        Return left, right, including_left, including_right with edges in
+        original domain.
+        """
+        return self.left, self.right, self.including_left, self.including_right
+
+    def __iter__(self) -> Iterator:
+        """
+        Description:
+        Yield each interval as `Interval` in order.
+        """
+        for edges in zip(
+            self.left.tolist(),
+            self.right.tolist(),
+            self.including_left.tolist(),
+            self.including_right.tolist()
+        ):
+            yield Interval(*edges)
+
+    def __getitem__(self, key:Any) -> Union[Interval, IntervalSet]:
+        """
+        Description:
+        1. `key`: int -> `Interval`
+        2. `key`: slice, bool array, etc -> `IntervalSet`
+        """
+        if isinstance(key, (int, np.integer)):
+            return Interval(
+                float(self.left[key]),
+                float(self.right[key]),
+                bool(self.including_left[key]),
+                bool(self.including_right[key])
+            )
+        return self.__class__.from_raw(
+            self.left[key],
+            self.right[key],
+            self.including_left[key],
+            self.including_right[key]
         )
+
+    def __repr__(self) -> str:
+        """
+        Description:
+        `self` will be represented as `{interval,...}`
+        """
+        return f"{{{','.join([repr(itvl) for itvl in self])}}}"
+
+    def __eq__(self, other:Any) -> bool:
+        other = self.__class__.from_any(other)
+        return len(self) == len(other) \
+            and np.array_equal(self.left, other.left) \
+            and np.array_equal(self.right, other.right) \
+            and np.array_equal(self.including_left, other.including_left) \
+            and np.array_equal(self.including_right, other.including_right)
+
+    def __add__(self, other:Any) -> IntervalSet:
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() + other
+        return self.union(other)
+
+    def __sub__(self, other:Any) -> IntervalSet:
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() - other
+        return self.difference(other)
+
+    def __and__(self, other:Any) -> IntervalSet:
+        if issubclass(type(other), LazyIntervals):
+            return self.lazy() & other
+        return self.intersection(other)
+
+    def max(self) -> Union[int, float]:
+        """
+        Description:
+        Return the maximum, just like `Interval.max`.
+        """
+        return self[-1].max()
+
+    def min(self) -> Union[int, float]:
+        """
+        Description:
+        Return the minimum, just like `Interval.min`.
+        """
+        return self[0].min()
+
+    def union(self, *others:Any) -> IntervalSet:
+        """
+        Description:
+        Union `self` with `others` in one sweep.
+
+        Params:
+        others: IntervalSet, Interval, Value, points, etc
+
+        Return:
+        IntervalSet
+        """
+        operands = [self, *[self.__class__.from_any(other) for other in others]]
+        return self.__class__.from_raw(*_sweep(operands, lambda cov: cov > 0))
+
+    def difference(self, other:Any) -> IntervalSet:
+        """
+        Description:
+        Get the elements in `self` but not in `other`.
+
+        Params:
+        other: IntervalSet, Interval, Value, points, etc
+
+        Return:
+        IntervalSet
+        """
+        operands = [self, self.__class__.from_any(other)]
+        return self.__class__.from_raw(
+            *_sweep(operands, lambda cov: cov[:, 0] & ~cov[:, 1], True)
+        )
+
+    def intersection(self, other:Any) -> IntervalSet:
+        """
+        Description:
+        Get the elements in both `self` and `other`.
+
+        Params:
+        other: IntervalSet, Interval, Value, points, etc
+
+        Return:
+        IntervalSet
+        """
+        operands = [self, self.__class__.from_any(other)]
+        return self.__class__.from_raw(
+            *_sweep(operands, lambda cov: cov == 2)
+        )
+
+    def complement(self) -> IntervalSet:
+        """
+        Description:
+        Get the complement of `self` from universe interval, (-inf, inf).
+        """
+        return self.__class__.from_intervals([UNI_INTERVAL]).difference(self)
+
+    def copy(self) -> IntervalSet:
+        """
+        Description:
+        Copy self
+        """
+        return self.__class__.from_raw(
+            self.left.copy(),
+            self.right.copy(),
+            self.including_left.copy(),
+            self.including_right.copy()
+        )
+
+    def contains_array(self, values:Iterable) -> np.ndarray:
+        """
+        Description:
+        Check if each element in `values` is contained in `self`, with
+        `np.searchsorted` over trimmed edges.
+        1. Convert edges into closed ones with next float, so that open
+           edges and closed edges could be compared in the same way
+        2. Locate the last interval starting before each element
+        3. Check if the element is before the end of the interval
+
+        P.S.
+        Intervals are trimmed, so the element won't be contained in
+        intervals before the located one.
+
+        Params:
+        values: array-like of numbers
+
+        Return:
+        bool array with the same shape of `values`
+        """
+        values = np.asarray(values, dtype=float)
+        if not self:
+            return np.zeros(values.shape, dtype=bool)
+        start = np.where(self.including_left, self.left, np.nextafter(self.left, INF))
+        end = np.where(self.including_right, self.right, np.nextafter(self.right, NINF))
+        idx = np.searchsorted(start, values, side="right") - 1
+        return (idx >= 0) & (values <= end[np.maximum(idx, 0)])
+
+    def lazy(self) -> LazyIntervals:
+        """
+        Description:
+        Wrap `self` as `LazyIntervals`, so that `+`, `-` and `&` with it
+        will be evaluated lazily.
+        """
+        return LazyIntervals.from_any(self)
+
+    def to_intervals(self) -> list:
+        """
+        Description:
+        Convert `self` into [Interval, ]
+        """
+        return list(self)
+
+    def to_pandas(self, split:bool=False) -> Union[pd.IntervalIndex, dict]:
+        """
+        Description:
+        Convert `self` into `pd.IntervalIndex` with edge arrays passed
+        through, instead of building `pd.Interval` for each interval.
+
+        P.S.
+        `pd.IntervalIndex` shares the closedness among all intervals, so
+        intervals in `self` should be split by closedness if mixed.
+
+        Params:
+        split: if to split intervals by closedness
+            False: return `pd.IntervalIndex`, and raise ValueError if
+                closedness is mixed
+            True: return {closed: `pd.IntervalIndex`}
+
+        Return:
+        pd.IntervalIndex or {closed: pd.IntervalIndex}
+        """
+        left, right, including_left, including_right = self.edges()
+        groups = {}
+        for (inc_left, inc_right), closed in PD_CLOSED.items():
+            mask = (including_left == inc_left) & (including_right == inc_right)
+            if mask.all():
+                groups = {closed: pd.IntervalIndex.from_arrays(
+                    left, right, closed=closed, copy=False)}
+                break
+            elif mask.any():
+                groups[closed] = pd.IntervalIndex.from_arrays(
+                    left[mask], right[mask], closed=closed, copy=False)
+
+        if split:
+            return groups
+        if len(groups) > 1:
+            raise ValueError("intervals with different closedness can't be "
+                "stored in one `pd.IntervalIndex`, try `split=True`")
+        return groups.popitem()[1]
+
+    def to_bytes(self) -> bytes:
+        """
+        Description:
+        Serialize `self` into compact bytes: edge arrays and closedness
+        bitmaps.
+        """
+        return _pack_intervals(
+            self.left,
+            self.right,
+            self.including_left,
+            self.including_right
+        )
+
+    def save(self, path:str) -> None:
+        """
+        Description:
+        Save `self` into file `path`, which could be loaded by `load`.
+        """
+        with open(path, "wb") as fp:
+            fp.write(self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, buf:Any) -> IntervalSet:
+        """
+        Description:
+        Create `IntervalSet` from bytes returned by `to_bytes`.
+
+        P.S.
+        Edge arrays share memory with `buf` and are read-only.
+
+        Params:
+        buf: bytes, memoryview, `np.memmap`, etc
+
+        Return:
+        IntervalSet
+        """
+        left, right, including_left, including_right, _ = _unpack_intervals(buf)
+        return cls.from_raw(left, right, including_left, including_right)
+
+    @classmethod
+    def load(cls, path:str) -> IntervalSet:
+        """
+        Description:
+        Load `IntervalSet` saved by `save` with `np.memmap`, so that edges
+        won't be read or copied until accessed, and processes loading the
+        same file share the page cache.
+        """
+        return cls.from_bytes(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    @classmethod
+    def from_raw(cls,
+        left:np.ndarray,
+        right:np.ndarray,
+        including_left:np.ndarray,
+        including_right:np.ndarray
+    ) -> IntervalSet:
+        """
+        Description:
+        Create `IntervalSet` with given arrays.
+        1. No additional check will be applied, which means that returned
+           `IntervalSet` may be invalid.
+
+        Params:
+        left
+        right
+        including_left
+        including_right
+
+        Return:
+        IntervalSet
+        """
+        inst = cls()
+        inst.left, inst.right = left, right
+        inst.including_left, inst.including_right = including_left, including_right
+        return inst
+
+    @classmethod
+    def from_points(cls, points:Iterable) -> IntervalSet:
+        """
+        Description:
+        Create `IntervalSet` containing only `points`.
+        """
+        points = np.asarray(list(points)) \
+            if not isinstance(points, np.ndarray) else points
+        return cls(points, points, True, True)
+
+    @classmethod
+    def from_intervals(cls, intervals:Iterable) -> IntervalSet:
+        """
+        Description:
+        Create `IntervalSet` from intervals and points, which will be
+        flattened first.
+
+        Params:
+        intervals: [Interval, int, float, etc]
+
+        Return:
+        IntervalSet
+        """
+        intervals, sized = partition_container(iter_flatten(intervals))
+        left = [itvl.left for itvl in intervals]
+        right = [itvl.right for itvl in intervals]
+        including_left = [itvl.including_left for itvl in intervals]
+        including_right = [itvl.including_right for itvl in intervals]
+        closed = np.ones(len(sized), dtype=bool)
+        return cls(
+            np.concatenate([np.asarray(left), sized]),
+            np.concatenate([np.asarray(right), sized]),
+            np.concatenate([np.asarray(including_left, dtype=bool), closed]),
+            np.concatenate([np.asarray(including_right, dtype=bool), closed])
+        )
+
+    @classmethod
+    def from_pandas(cls, other:Any, trimmed:bool=False) -> IntervalSet:
+        """
+        Description:
+        Create `IntervalSet` from `pd.IntervalIndex`, `pd.arrays.IntervalArray`
+        or series of intervals with edge arrays passed through, and
+        groups split by `to_pandas` could be joined.
+        1. Null intervals will be dropped if not `trimmed`
+
+        Params:
+        other: pd.IntervalIndex, pd.arrays.IntervalArray, interval Series,
+            or iterable of them, {closed: pd.IntervalIndex} included
+        trimmed: if intervals are already sorted and trimmed
+
+        Return:
+        IntervalSet
+        """
+        if isinstance(other, dict):
+            other = list(other.values())
+        if isinstance(other, pd.Series):
+            other = other.array
+        if not isinstance(other, (pd.IntervalIndex, pd.arrays.IntervalArray)):
+            others = [cls.from_pandas(ele, trimmed=True) for ele in other]
+            return others[0].union(*others[1:]) if others else cls()
+
+        inc_left = other.closed in ("left", "both")
+        inc_right = other.closed in ("right", "both")
+        left, right = other.left.to_numpy(), other.right.to_numpy()
+        return cls(left, right, inc_left, inc_right, trimmed)
+
+    @classmethod
+    def from_strs(cls, strs:Iterable) -> IntervalSet:
+        """
+        Description:
+        Create `IntervalSet` from strings like "(left, right]" with
+        `parse_intervals`, and strings can't be parsed will be ignored.
+        """
+        return cls(*parse_intervals(strs, how="arrays"))
+
+    @classmethod
+    def from_any(cls, other:Any) -> IntervalSet:
+        """
+        Description:
+        Convert `other` into `IntervalSet`
+        1. `other`: same class -> return directly
+        2. `other`: other `IntervalSet` -> convert with original edges
+        3. `other`: Value -> `Value.to_interval_set`
+        4. `other`: Interval, int, float, [Interval, int, float]
+           -> `from_intervals`
+
+        Params:
+        other
+
+        Return:
+        IntervalSet
+        """
+        if type(other) is cls:
+            return other
+        elif issubclass(type(other), IntervalSet):
+            return cls(*other.edges(), trimmed=True)
+        elif issubclass(type(other), Value):
+            return cls.from_any(other.to_interval_set())
+        elif issubclass(type(other), Iterable):
+            return cls.from_intervals(other)
+        else:
+            return cls.from_intervals([other, ])
+
+
+# %%
+class EncodedIntervalSet(IntervalSet):
+    # Edges are stored as int64 codes
+    dtype = np.int64
+
+    def __init__(
+        self,
+        left:Iterable=(),
+        right:Iterable=(),
+        including_left:Union[bool, Iterable]=True,
+        including_right:Union[bool, Iterable]=False,
+        trimmed:bool=False
+    ) -> None:
+        """
+        Description:
+        `IntervalSet` with edges encoded as int64, so that keys in sweeps
+        are exact and compared as integers instead of floats.
+        1. Floats are encoded as ordered float bits, in which the order of
+           codes is the same as the order of floats, and code + 1 is just
+           the next float
+        2. Closedness is the bit added to the code when building keys:
+           `start` = `left` + not including-left,
+           `end` = `right` + including-right
+        3. Null edges, nan or NaT, are dropped before encoding
+
+        P.S.
+        Use `DatetimeIntervalSet` for datetimes, which are encoded as int64
+        nanoseconds.
+
+        Params:
+        left: left edges in original domain
+        right: right edges in original domain
+        including_left: bool or bools for each interval
+        including_right: bool or bools for each interval
+        trimmed: if intervals are already sorted and trimmed
+
+        Return:
+        """
+        left, right = np.asarray(left).ravel(), np.asarray(right).ravel()
+        if len(left):
+            including_left = np.broadcast_to(
+                np.asarray(including_left, dtype=bool).ravel(), left.shape)
+            including_right = np.broadcast_to(
+                np.asarray(including_right, dtype=bool).ravel(), right.shape)
+            valid = ~(pd.isna(left) | pd.isna(right))
+            left, right = left[valid], right[valid]
+            including_left = including_left[valid]
+            including_right = including_right[valid]
+        super().__init__(
+            self.encode(left),
+            self.encode(right),
+            including_left,
+            including_right,
+            trimmed
+        )
+
+    @staticmethod
+    def encode(values:Any) -> np.ndarray:
+        """
+        Description:
+        Encode floats into ordered float bits.
+        1. Reinterpret float64 as int64
+        2. Flip all bits except sign for negative ones, so that larger
+           magnitude gets smaller code
+
+        P.S.
+        -0.0 will be normalized into 0.0 first.
+        """
+        values = np.asarray(values, dtype=float) + 0.0
+        bits = values.view(np.int64)
+        return bits ^ ((bits >> 63) & np.int64(0x7FFFFFFFFFFFFFFF))
+
+    @staticmethod
+    def decode(codes:Any) -> np.ndarray:
+        """
+        Description:
+        Decode codes into floats, reverse of `encode`.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        return (codes ^ ((codes >> 63) & np.int64(0x7FFFFFFFFFFFFFFF))).view(float)
+
+    @classmethod
+    def to_scalars(cls, codes:Any) -> list:
+        """
+        Description:
+        Decode codes into list of python scalars, for `Interval`.
+        """
+        return cls.decode(codes).tolist()
+
+    @classmethod
+    def universe(cls) -> Tuple[np.ndarray, ...]:
+        """
+        Description:
+        Return codes of universe interval, (-inf, inf).
+        """
+        return (cls.encode([NINF]), cls.encode([INF]),
+            np.array([False]), np.array([False]))
+
+    def keys(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description:
+        Return half-open keys `[start, end)` with closedness bit added.
+        """
+        return (self.left + ~self.including_left,
+            self.right + self.including_right)
+
+    def edges(self) -> Tuple[np.ndarray, ...]:
+        return (self.decode(self.left), self.decode(self.right),
+            self.including_left, self.including_right)
+
+    def __iter__(self) -> Iterator:
+        for edges in zip(
+            self.to_scalars(self.left),
+            self.to_scalars(self.right),
+            self.including_left.tolist(),
+            self.including_right.tolist()
+        ):
+            yield Interval(*edges)
+
+    def __getitem__(self, key:Any) -> Union[Interval, IntervalSet]:
+        if isinstance(key, (int, np.integer)):
+            left, right = self.to_scalars(
+                np.array([self.left[key], self.right[key]]))
+            return Interval(
+                left,
+                right,
+                bool(self.including_left[key]),
+                bool(self.including_right[key])
+            )
+        return super().__getitem__(key)
+
+    def max(self) -> Any:
+        """
+        Description:
+        Return the exact maximum, the previous value of the right edge if
+        it's open.
+        """
+        return self.to_scalars(self.right[-1:] - ~self.including_right[-1:])[0]
+
+    def min(self) -> Any:
+        """
+        Description:
+        Return the exact minimum, the next value of the left edge if it's
+        open.
+        """
+        return self.to_scalars(self.left[:1] + ~self.including_left[:1])[0]
+
+    def complement(self) -> EncodedIntervalSet:
+        return self.__class__.from_raw(*self.universe()).difference(self)
+
+    def contains_array(self, values:Iterable) -> np.ndarray:
+        """
+        Description:
+        Check if each element in `values` is contained in `self`, with
+        `np.searchsorted` over integer keys.
+
+        Params:
+        values: array-like in original domain
+
+        Return:
+        bool array with the same shape of `values`
+        """
+        values = np.asarray(values)
+        if not self:
+            return np.zeros(values.shape, dtype=bool)
+        codes = self.encode(values)
+        start, end = self.keys()
+        idx = np.searchsorted(start, codes, side="right") - 1
+        contained = (idx >= 0) & (codes < end[np.maximum(idx, 0)])
+        return contained & ~pd.isna(values)
+
+    def to_interval_set(self) -> IntervalSet:
+        """
+        Description:
+        Decode `self` into `IntervalSet`.
+        """
+        return IntervalSet(*self.edges(), trimmed=True)
+
+    def to_bytes(self) -> bytes:
+        """
+        Description:
+        Serialize int64 codes of `self` directly, with the layout of
+        `IntervalSet.to_bytes` marked by `BYTES_CODES_MAGIC`.
+        """
+        return _pack_intervals(
+            self.left,
+            self.right,
+            self.including_left,
+            self.including_right,
+            magic=BYTES_CODES_MAGIC
+        )
+
+    @classmethod
+    def from_bytes(cls, buf:Any) -> EncodedIntervalSet:
+        """
+        Description:
+        Create `EncodedIntervalSet` from bytes returned by `to_bytes`, with
+        codes sharing memory with `buf`, or from bytes returned by
+        `IntervalSet.to_bytes`, which will be encoded.
+        """
+        if bytes(buf[:8]) == BYTES_MAGIC:
+            return cls.from_any(IntervalSet.from_bytes(buf))
+        left, right, including_left, including_right, _ = \
+            _unpack_intervals(buf, BYTES_CODES_MAGIC)
+        return cls.from_raw(left, right, including_left, including_right)
+
+
+class DatetimeIntervalSet(EncodedIntervalSet):
+    """
+    Description:
+    `EncodedIntervalSet` for datetimes, with edges encoded as int64
+    nanoseconds, and code + 1 is just the next nanosecond.
+
+    P.S.
+    Including the maximum nanosecond, which is the code before overflow,
+    is not supported.
+    """
+    @staticmethod
+    def encode(values:Any) -> np.ndarray:
+        shape = np.shape(values)
+        values = pd.to_datetime(np.asarray(values).ravel())
+        return np.asarray(values, dtype="datetime64[ns]").view(np.int64).reshape(shape)
+
+    @staticmethod
+    def decode(codes:Any) -> np.ndarray:
+        return np.asarray(codes, dtype=np.int64).view("datetime64[ns]")
+
+    @classmethod
+    def to_scalars(cls, codes:Any) -> list:
+        return pd.to_datetime(np.asarray(codes, dtype=np.int64)).tolist()
+
+    @classmethod
+    def universe(cls) -> Tuple[np.ndarray, ...]:
+        # Minimum int64 is reserved for NaT
+        info = np.iinfo(np.int64)
+        return (np.array([info.min + 1]), np.array([info.max]),
+            np.array([True]), np.array([False]))
+
+
+# %%
+def parse_intervals(strs:Iterable, how:str="arrays") -> Any:
+    """
+    Description:
+    Parse strings like "(1.5, 3]" into intervals in bulk.
+    1. Match all strings with compiled `INTERVAL_REGEX` by `str.extract`
+    2. Convert edges into float with `pd.to_numeric`
+    3. Strings can't be parsed, either edge included, will get `nan` for
+       both edges
+
+    Params:
+    strs: series or list of strings
+    how: how to return the intervals
+        "arrays": left, right, including_left, including_right, aligned
+            with `strs`
+        "pandas": `pd.arrays.IntervalArray` aligned with `strs`, which
+            requires all intervals share the same closedness
+        "set": `IntervalSet`, which is sorted and trimmed
+
+    Return:
+    intervals in format determined by `how`
+    """
+    strs = pd.Series(strs, dtype=object)
+    parts = strs.str.extract(f"^{INTERVAL_REGEX.pattern}$", expand=True)
+    left = pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype=float)
+    right = pd.to_numeric(parts[2], errors="coerce").to_numpy(dtype=float)
+    invalid = np.isnan(left) | np.isnan(right)
+    left, right = np.where(invalid, NAN, left), np.where(invalid, NAN, right)
+    including_left = (parts[0] == "[").to_numpy()
+    including_right = (parts[3] == "]").to_numpy()
+
+    if how == "arrays":
+        return left, right, including_left, including_right
+    elif how == "set":
+        return IntervalSet(left, right, including_left, including_right)
+    elif how == "pandas":
+        # `pd.arrays.IntervalArray` refuses inverted intervals too
+        invalid |= left > right
+        left, right = np.where(invalid, NAN, left), np.where(invalid, NAN, right)
+        valid = ~invalid
+        closedness = set(zip(including_left[valid], including_right[valid]))
+        if len(closedness) > 1:
+            raise ValueError("intervals with different closedness can't be "
+                "stored in `pd.arrays.IntervalArray`")
+        closed = PD_CLOSED[closedness.pop() if closedness else (False, True)]
+        return pd.arrays.IntervalArray.from_arrays(left, right, closed=closed)
+    else:
+        raise ValueError(f"unrecognized parameter for `how`: {how}")
+
+
+# %%
+class LazyIntervals:
+    # Operators and their predicates on coverage of operands
+    OPERATORS = {
+        "+": lambda left, right: left | right,
+        "-": lambda left, right: left & ~right,
+        "&": lambda left, right: left & right,
+    }
+
+    def __init__(self, op:str="leaf", operands:list=None) -> None:
+        """
+        Description:
+        Lazy expression of intervals, built by `+`, `-` and `&`, which will
+        be evaluated only once when materialized.
+        1. Leaf: `op` is "leaf", and `operands` is [source, ], in which
+           source could be `Interval`, `Value`, `IntervalSet`, etc
+        2. Node: `op` is one of `OPERATORS`, and `operands` are two
+           `LazyIntervals`
+        Evaluation sorts all edges of all leaves once, and then applies
+        the operators on coverage, so a long expression won't flatten, copy
+        and trim its operands at each step.
+
+        Params:
+        op: "leaf", "+", "-" or "&"
+        operands: [source, ] for leaf, or [LazyIntervals, LazyIntervals]
+
+        Return:
+        """
+        self.op = op
+        self.operands = [] if operands is None else operands
+        self._evaluated = None
+
+    def __add__(self, other:Any) -> LazyIntervals:
+        return self.__class__("+", [self, self.__class__.from_any(other)])
+
+    def __radd__(self, other:Any) -> LazyIntervals:
+        return self.__class__("+", [self.__class__.from_any(other), self])
+
+    def __sub__(self, other:Any) -> LazyIntervals:
+        return self.__class__("-", [self, self.__class__.from_any(other)])
+
+    def __rsub__(self, other:Any) -> LazyIntervals:
+        return self.__class__("-", [self.__class__.from_any(other), self])
+
+    def __and__(self, other:Any) -> LazyIntervals:
+        return self.__class__("&", [self, self.__class__.from_any(other)])
+
+    def __rand__(self, other:Any) -> LazyIntervals:
+        return self.__class__("&", [self.__class__.from_any(other), self])
+
+    def __repr__(self) -> str:
+        if self.op == "leaf":
+            return repr(self.operands[0])
+        return f"({self.operands[0]!r} {self.op} {self.operands[1]!r})"
+
+    def leaves(self) -> list:
+        """
+        Description:
+        Return sources of all leaves, and the same source will be returned
+        only once.
+        """
+        sources, stack = {}, [self]
+        while stack:
+            node = stack.pop()
+            if node.op == "leaf":
+                sources.setdefault(id(node.operands[0]), node.operands[0])
+            else:
+                stack.extend(reversed(node.operands))
+        return list(sources.values())
+
+    def __apply(self, covered:Callable, positions:dict) -> np.ndarray:
+        """
+        Description:
+        Apply operators on coverage of leaves in post-order.
+        1. Maximal subtree of "+" or "&" is flattened, and all leaves in it
+           are reduced with one count vector by `covered`
+        2. Other nodes are combined with `OPERATORS`
+        So only one bool array for each pending node is kept, instead of
+        coverage of all leaves.
+
+        P.S.
+        Stack is used instead of recursion, so that long expressions
+        won't exceed the recursion limit.
+
+        Params:
+        covered: callable accepting positions of leaves and operator "+"
+            or "&", and returning bool array with shape (n_keys, )
+        positions: mapper from id of source to position in leaves
+
+        Return:
+        bool array with shape (n_keys, )
+        """
+        results, stack = [], [(self, None)]
+        while stack:
+            node, state = stack.pop()
+            if node.op == "leaf":
+                results.append(covered([positions[id(node.operands[0])]], "+"))
+            elif node.op == "-":
+                if state is None:
+                    stack.append((node, True))
+                    stack.extend([(node.operands[1], None), (node.operands[0], None)])
+                else:
+                    right = results.pop()
+                    left = results.pop()
+                    results.append(self.OPERATORS["-"](left, right))
+            elif state is None:
+                # Flatten subtree with the same operator
+                leaves, others, todo = set(), [], [node]
+                while todo:
+                    cur = todo.pop()
+                    if cur.op == "leaf":
+                        leaves.add(positions[id(cur.operands[0])])
+                    elif cur.op == node.op:
+                        todo.extend(cur.operands)
+                    else:
+                        others.append(cur)
+                stack.append((node, (sorted(leaves), len(others))))
+                stack.extend((other, None) for other in others)
+            else:
+                leaves, n_others = state
+                kept = covered(leaves, node.op) if leaves else None
+                for _ in range(n_others):
+                    other = results.pop()
+                    kept = other if kept is None \
+                        else self.OPERATORS[node.op](kept, other)
+                results.append(kept)
+        return results[0]
+
+    def evaluate(self) -> IntervalSet:
+        """
+        Description:
+        Materialize the expression with edges of all leaves sorted once,
+        and the result will be cached.
+        1. Edges are grouped by leaf, so that coverage of any group of
+           leaves could be counted with their edges only
+        2. Union of leaves is count `> 0` and intersection of `k` leaves
+           is count `== k`, since leaves are trimmed
+
+        Return:
+        IntervalSet
+        """
+        if self._evaluated is not None:
+            return self._evaluated
+
+        sources = self.leaves()
+        positions = {id(src): pos for pos, src in enumerate(sources)}
+        operands = [IntervalSet.from_any(src) for src in sources]
+        swept = _sweep_edges(operands)
+        if swept is None:
+            self._evaluated = IntervalSet()
+            return self._evaluated
+        uidx, opids, deltas, edges, shifted, is_new = swept
+        n_keys = int(uidx[-1]) + 1
+        by_leaf = np.argsort(opids, kind="stable")
+        bounds = np.searchsorted(opids[by_leaf], np.arange(len(operands) + 1))
+
+        def covered(leaves:list, op:str) -> np.ndarray:
+            idx = np.concatenate([by_leaf[bounds[pos]: bounds[pos + 1]]
+                for pos in leaves])
+            count = np.bincount(uidx[idx], weights=deltas[idx],
+                minlength=n_keys).cumsum()
+            return count > 0 if op == "+" else count == len(leaves)
+
+        self._evaluated = IntervalSet.from_raw(*_sweep_spans(
+            self.__apply(covered, positions), edges, shifted, is_new))
+        return self._evaluated
+
+    def to_value(self) -> Value:
+        """
+        Description:
+        Materialize the expression as `Value` with `IntervalSet` as storage.
+        """
+        return Value.from_interval_set(self.evaluate())
+
+    @classmethod
+    def from_any(cls, other:Any) -> LazyIntervals:
+        """
+        Description:
+        Wrap `other` as leaf, unless `other` is already `LazyIntervals`.
+        """
+        if issubclass(type(other), cls):
+            return other
+        return cls("leaf", [other, ])
+
+
+# %%
+def _expand_prefixes(
+    qidx:np.ndarray,
+    counts:np.ndarray,
+    ids:np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Description:
+    Pair each query in `qidx` with the first `counts` elements in `ids`.
+
+    Params:
+    qidx: index of queries
+    counts: number of elements for each query
+    ids: elements to be paired
+
+    Return:
+    index of queries, elements
+    """
+    total = counts.sum()
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(qidx, counts), ids[offsets]
+
+
+class _IntervalTreeNode:
+    __slots__ = ("center", "ids", "by_start", "starts", "by_end", "neg_ends",
+        "left", "right")
+
+    def __init__(self, center:Union[float, None]=None) -> None:
+        """
+        Description:
+        Node of `IntervalTree`
+        1. Leaf node: `center` is None, and `ids` store intervals in the
+           node without any order
+        2. Inner node: intervals containing `center` are stored in
+           `by_start` ordered by start, and `by_end` ordered by end
+           descendingly, while intervals on the left or right side are
+           stored in `left` and `right` children
+        """
+        self.center = center
+        self.ids = None
+        self.by_start, self.starts = None, None
+        self.by_end, self.neg_ends = None, None
+        self.left, self.right = None, None
+
+    def set_ids(self, ids:np.ndarray, start:np.ndarray, end:np.ndarray) -> None:
+        """
+        Description:
+        Set intervals containing `center` with their closed edges.
+        """
+        order = np.argsort(start, kind="stable")
+        self.by_start, self.starts = ids[order], start[order]
+        order = np.argsort(-end, kind="stable")
+        self.by_end, self.neg_ends = ids[order], -end[order]
+
+    def insert(self, iid:int, start:float, end:float) -> None:
+        """
+        Description:
+        Insert interval containing `center` into sorted arrays.
+        """
+        pos = np.searchsorted(self.starts, start, side="right")
+        self.by_start = np.insert(self.by_start, pos, iid)
+        self.starts = np.insert(self.starts, pos, start)
+        pos = np.searchsorted(self.neg_ends, -end, side="right")
+        self.by_end = np.insert(self.by_end, pos, iid)
+        self.neg_ends = np.insert(self.neg_ends, pos, -end)
+
+
+class IntervalTree(Sized):
+    leaf_size = 32
+
+    def __init__(
+        self,
+        left:Iterable=(),
+        right:Iterable=(),
+        including_left:Union[bool, Iterable]=True,
+        including_right:Union[bool, Iterable]=False
+    ) -> None:
+        """
+        Description:
+        Centered interval tree indexing intervals which may overlap with
+        each other, so that stabbing and overlap queries could be answered
+        in O(log n + k) instead of scanning all intervals.
+        1. Each interval is identified by its position when inserted, and
+           id won't change after insertion or deletion
+        2. Edges are converted into closed ones with next float, so open
+           and closed edges are compared in the same way
+        3. Queries are batched: all queries are routed through the tree
+           together with vectorized `np.searchsorted`
+
+        P.S.
+        Deleted intervals are only marked until they are more than the
+        intervals alive, and then the tree will be rebuilt. The tree will
+        also be rebuilt when intervals inserted are more than intervals
+        at last building, to keep the tree balanced.
+
+        Params:
+        left: left edges
+        right: right edges
+        including_left: bool or bools for each interval
+        including_right: bool or bools for each interval
+
+        Return:
+        """
+        left = np.asarray(left, dtype=float).ravel()
+        right = np.asarray(right, dtype=float).ravel()
+        self.left, self.right = left, right
+        self.including_left = np.broadcast_to(
+            np.asarray(including_left, dtype=bool), left.shape).copy()
+        self.including_right = np.broadcast_to(
+            np.asarray(including_right, dtype=bool), left.shape).copy()
+        self._start, self._end = _edge_keys(
+            left, right, self.including_left, self.including_right)
+        # `_end` is exclusive in `_edge_keys`, convert it into closed one
+        self._end = np.nextafter(self._end, NINF)
+        self._alive = self._start <= self._end
+        self._size = len(left)
+        self.__build()
+
+    def __build(self) -> None:
+        """
+        Description:
+        Rebuild the whole tree with intervals alive.
+        """
+        self.root = self.__build_node(np.flatnonzero(self._alive[:self._size]))
+        self._n_alive = int(np.count_nonzero(self._alive[:self._size]))
+        self._n_dead = 0
+        self._n_inserted = 0
+
+    def __build_node(self, ids:np.ndarray) -> Union[_IntervalTreeNode, None]:
+        """
+        Description:
+        Build sub-tree recursively.
+        1. Store intervals in leaf if there are only a few ones
+        2. Choose median of edges as center, so both children will
+           contain less intervals
+        """
+        if len(ids) == 0:
+            return None
+        if len(ids) <= self.leaf_size:
+            node = _IntervalTreeNode()
+            node.ids = ids
+            return node
+
+        start, end = self._start[ids], self._end[ids]
+        # Clip infinite edges, or median may be nan
+        center = float(np.median(np.clip(
+            np.concatenate([start, end]),
+            np.finfo(float).min,
+            np.finfo(float).max
+        )))
+        to_left, to_right = end < center, start > center
+        on_center = ~(to_left | to_right)
+
+        node = _IntervalTreeNode(center)
+        node.set_ids(ids[on_center], start[on_center], end[on_center])
+        node.left = self.__build_node(ids[to_left])
+        node.right = self.__build_node(ids[to_right])
+        return node
+
+    def __len__(self) -> int:
+        return self._n_alive
+
+    def __getitem__(self, iid:int) -> Interval:
+        """
+        Description:
+        Return interval with id `iid` as `Interval`.
+        """
+        if not (0 <= iid < self._size):
+            raise IndexError(f"interval id {iid} out of range")
+        return Interval(
+            float(self.left[iid]),
+            float(self.right[iid]),
+            bool(self.including_left[iid]),
+            bool(self.including_right[iid])
+        )
+
+    def __contains__(self, iid:int) -> bool:
+        return 0 <= iid < self._size and bool(self._alive[iid])
+
+    def __repr__(self) -> str:
+        return f"IntervalTree({len(self)} intervals)"
+
+    def __grow(self) -> None:
+        """
+        Description:
+        Double capacity of the arrays storing intervals.
+        """
+        capacity = max(2 * len(self.left), 16)
+        for attr in ("left", "right", "including_left", "including_right",
+            "_start", "_end", "_alive"):
+            old = getattr(self, attr)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, attr, new)
+
+    def insert(self, interval:Interval) -> int:
+        """
+        Description:
+        Insert `interval` into the tree.
+        1. Descend to the node whose center is contained by `interval`,
+           and insert it into sorted arrays of the node
+        2. Or append it to the leaf, which will be split if it's too large
+
+        Params:
+        interval
+
+        Return:
+        id of the interval inserted
+        """
+        if self._size == len(self.left):
+            self.__grow()
+        iid = self._size
+        self._size += 1
+        self.left[iid], self.right[iid] = interval.left, interval.right
+        self.including_left[iid] = interval.including_left
+        self.including_right[iid] = interval.including_right
+        start, end = _edge_keys(
+            self.left[iid:iid + 1],
+            self.right[iid:iid + 1],
+            self.including_left[iid:iid + 1],
+            self.including_right[iid:iid + 1]
+        )
+        start, end = float(start[0]), float(np.nextafter(end[0], NINF))
+        self._start[iid], self._end[iid] = start, end
+        # Null interval won't be indexed
+        self._alive[iid] = start <= end
+        if not self._alive[iid]:
+            return iid
+
+        self._n_alive += 1
+        self._n_inserted += 1
+        if self._n_inserted > self._n_alive // 2:
+            self.__build()
+        else:
+            self.root = self.__insert_node(self.root, iid, start, end)
+        return iid
+
+    def __insert_node(
+        self,
+        node:Union[_IntervalTreeNode, None],
+        iid:int,
+        start:float,
+        end:float
+    ) -> _IntervalTreeNode:
+        if node is None:
+            node = _IntervalTreeNode()
+            node.ids = np.array([iid])
+        elif node.center is None:
+            node.ids = np.append(node.ids, iid)
+            if len(node.ids) > 2 * self.leaf_size:
+                node = self.__build_node(node.ids[self._alive[node.ids]])
+        elif end < node.center:
+            node.left = self.__insert_node(node.left, iid, start, end)
+        elif start > node.center:
+            node.right = self.__insert_node(node.right, iid, start, end)
+        else:
+            node.insert(iid, start, end)
+        return node
+
+    def delete(self, iid:int) -> None:
+        """
+        Description:
+        Delete interval with id `iid` from the tree.
+
+        Params:
+        iid: id of the interval
+
+        Return:
+        """
+        if iid not in self:
+            raise KeyError(f"interval id {iid} not found")
+        self._alive[iid] = False
+        self._n_alive -= 1
+        self._n_dead += 1
+        if self._n_dead > self._n_alive:
+            self.__build()
+
+    def __finish(self, found:list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description:
+        Concatenate pairs found, drop intervals deleted, and sort them.
+        """
+        if not found:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        qidx = np.concatenate([pair[0] for pair in found]).astype(np.int64)
+        ids = np.concatenate([pair[1] for pair in found]).astype(np.int64)
+        alive = self._alive[ids]
+        qidx, ids = qidx[alive], ids[alive]
+        order = np.lexsort((ids, qidx))
+        return qidx[order], ids[order]
+
+    def stab(self, values:Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description:
+        Find intervals containing each element in `values`.
+
+        Params:
+        values: array-like of numbers
+
+        Return:
+        qidx: index of elements in `values`
+        ids: id of intervals containing `values[qidx]`
+        """
+        values = np.atleast_1d(np.asarray(values, dtype=float)).ravel()
+        qidx = np.flatnonzero(~np.isnan(values))
+        found = []
+        self.__stab_node(self.root, qidx, values[qidx], found)
+        return self.__finish(found)
+
+    def __stab_node(
+        self,
+        node:Union[_IntervalTreeNode, None],
+        qidx:np.ndarray,
+        values:np.ndarray,
+        found:list
+    ) -> None:
+        if node is None or len(qidx) == 0:
+            return
+        if node.center is None:
+            hit = (self._start[node.ids] <= values[:, None]) \
+                & (values[:, None] <= self._end[node.ids])
+            qpos, ipos = np.nonzero(hit)
+            found.append((qidx[qpos], node.ids[ipos]))
+            return
+
+        # Queries on the left side: intervals starting before them
+        # Queries on the right side: intervals ending after them
+        # Queries on the center: all intervals in the node
+        lt, gt = values < node.center, values > node.center
+        eq = ~(lt | gt)
+        found.append(_expand_prefixes(
+            qidx[lt],
+            np.searchsorted(node.starts, values[lt], side="right"),
+            node.by_start
+        ))
+        found.append(_expand_prefixes(
+            qidx[gt],
+            np.searchsorted(node.neg_ends, -values[gt], side="right"),
+            node.by_end
+        ))
+        found.append(_expand_prefixes(
+            qidx[eq],
+            np.full(np.count_nonzero(eq), len(node.by_start)),
+            node.by_start
+        ))
+        self.__stab_node(node.left, qidx[lt], values[lt], found)
+        self.__stab_node(node.right, qidx[gt], values[gt], found)
+
+    def overlap(
+        self,
+        left:Iterable,
+        right:Iterable,
+        including_left:Union[bool, Iterable]=True,
+        including_right:Union[bool, Iterable]=True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description:
+        Find intervals overlapping each query interval.
+
+        Params:
+        left: left edges of query intervals
+        right: right edges of query intervals
+        including_left: bool or bools for each query interval
+        including_right: bool or bools for each query interval
+
+        Return:
+        qidx: index of query intervals
+        ids: id of intervals overlapping query interval `qidx`
+        """
+        left = np.atleast_1d(np.asarray(left, dtype=float)).ravel()
+        right = np.atleast_1d(np.asarray(right, dtype=float)).ravel()
+        start, end = _edge_keys(left, right, including_left, including_right)
+        end = np.nextafter(end, NINF)
+        # Null query intervals, nan edges included, overlap nothing
+        qidx = np.flatnonzero(start <= end)
+        found = []
+        self.__overlap_node(self.root, qidx, start[qidx], end[qidx], found)
+        return self.__finish(found)
+
+    def __overlap_node(
+        self,
+        node:Union[_IntervalTreeNode, None],
+        qidx:np.ndarray,
+        start:np.ndarray,
+        end:np.ndarray,
+        found:list
+    ) -> None:
+        if node is None or len(qidx) == 0:
+            return
+        if node.center is None:
+            hit = (self._start[node.ids] <= end[:, None]) \
+                & (start[:, None] <= self._end[node.ids])
+            qpos, ipos = np.nonzero(hit)
+            found.append((qidx[qpos], node.ids[ipos]))
+            return
+
+        # Queries on the left side: intervals starting before their ends
+        # Queries on the right side: intervals ending after their starts
+        # Queries covering the center: all intervals in the node
+        lt, gt = end < node.center, start > node.center
+        on_center = ~(lt | gt)
+        found.append(_expand_prefixes(
+            qidx[lt],
+            np.searchsorted(node.starts, end[lt], side="right"),
+            node.by_start
+        ))
+        found.append(_expand_prefixes(
+            qidx[gt],
+            np.searchsorted(node.neg_ends, -start[gt], side="right"),
+            node.by_end
+        ))
+        found.append(_expand_prefixes(
+            qidx[on_center],
+            np.full(np.count_nonzero(on_center), len(node.by_start)),
+            node.by_start
+        ))
+        to_left, to_right = start < node.center, end > node.center
+        self.__overlap_node(node.left, qidx[to_left], start[to_left], end[to_left], found)
+        self.__overlap_node(node.right, qidx[to_right], start[to_right], end[to_right], found)
+
+    @classmethod
+    def from_intervals(cls, intervals:Iterable) -> IntervalTree:
+        """
+        Description:
+        Create `IntervalTree` from [Interval, ], in which order of
+        intervals will be kept as their ids.
+        """
+        intervals = list(intervals)
+        return cls(
+            [itvl.left for itvl in intervals],
+            [itvl.right for itvl in intervals],
+            [itvl.including_left for itvl in intervals],
+            [itvl.including_right for itvl in intervals]
+        )
+
+
+# %%
+def _bin_label(bin_:Any) -> Any:
+    """
+    Description:
+    Use `bin_` as category label if hashable, else its representation.
+    """
+    try:
+        hash(bin_)
+        return bin_
+    except TypeError:
+        return repr(bin_)
+
+
+class Discretizer:
+    def __init__(self, bins:Iterable, labels:Iterable=None) -> None:
+        """
+        Description:
+        Map values to bins in one vectorized pass, in which each bin could
+        mix intervals with open and closed edges, single points, `nan` and
+        pre-defined special values.
+        1. Intervals: `Interval`, `IntervalSet`, `Value.intervals`,
+           `pd.Interval`, `pd.IntervalIndex`, which are located with
+           `np.searchsorted`
+        2. Points: scalars, strings, elements in set, `Value.sized`, which
+           are looked up with hash, and take precedence over intervals
+        3. `nan`, `None` and "nan": bin for missing values
+
+        Params:
+        bins: [bin, ], in which bin could be any mixture above
+        labels: category labels for each bin, and `bins` will be used as
+            labels if not provided, while unhashable ones will be
+            represented as string
+
+        Return:
+        """
+        self.bins = list(bins)
+        if labels is None:
+            self.categories = [_bin_label(bin_) for bin_ in self.bins]
+        else:
+            self.categories = list(labels)
+        if len(self.categories) != len(self.bins):
+            raise ValueError("`labels` must share the same length with `bins`")
+
+        self.nan_code = -1
+        self.__pieces, self.__points = [], {}
+        for code, bin_ in enumerate(self.bins):
+            self.__collect(code, bin_)
+        self.__set_pieces()
+        self.__set_points()
+
+    def __collect(self, code:int, bin_:Any) -> None:
+        """
+        Description:
+        Collect intervals and points in `bin_` recursively.
+        """
+        if issubclass(type(bin_), Interval):
+            self.__pieces.append((code, bin_.left, bin_.right,
+                bin_.including_left, bin_.including_right))
+        elif issubclass(type(bin_), IntervalSet):
+            for itvl in bin_:
+                self.__collect(code, itvl)
+        elif issubclass(type(bin_), Value):
+            for itvl in bin_.intervals:
+                self.__collect(code, itvl)
+            for ele in bin_.sized:
+                self.__collect(code, ele)
+        elif isinstance(bin_, pd.Interval):
+            self.__pieces.append((code, bin_.left, bin_.right,
+                bin_.closed_left, bin_.closed_right))
+        elif isinstance(bin_, (pd.IntervalIndex, pd.arrays.IntervalArray)):
+            self.__collect(code, IntervalSet.from_pandas(bin_))
+        elif isinstance(bin_, (set, frozenset, list, tuple)):
+            for ele in bin_:
+                self.__collect(code, ele)
+        else:
+            is_nan = pd.isna(bin_)
+            if is_nan or (isinstance(bin_, str) and bin_ == "nan"):
+                if self.nan_code >= 0 and self.nan_code != code:
+                    raise ValueError("`nan` is found in more than one bins")
+                self.nan_code = code
+                # "nan" is kept as point, for values filled with "nan"
+                if is_nan:
+                    return
+            if self.__points.setdefault(bin_, code) != code:
+                raise ValueError(f"`{bin_}` is found in more than one bins")
+
+    def __set_pieces(self) -> None:
+        """
+        Description:
+        Sort intervals by closed start, and check if they overlap.
+        """
+        codes, left, right, including_left, including_right = \
+            map(np.asarray, zip(*self.__pieces)) if self.__pieces \
+            else [np.empty(0)] * 5
+        left, right = left.astype(float), right.astype(float)
+        start, end = _edge_keys(left, right,
+            including_left.astype(bool), including_right.astype(bool))
+        end = np.nextafter(end, NINF)
+        valid = start <= end
+        order = np.argsort(start[valid], kind="stable")
+        self.starts = start[valid][order]
+        self.ends = end[valid][order]
+        self.codes = codes[valid][order].astype(np.int64)
+        if np.any(self.starts[1:] <= np.maximum.accumulate(self.ends)[:-1]):
+            raise ValueError("intervals in `bins` overlap with each other")
+
+    def __set_points(self) -> None:
+        """
+        Description:
+        Build hash index for numeric points and other points seperately,
+        so that numeric values won't be hashed as objects.
+        """
+        numeric = {k: v for k, v in self.__points.items()
+            if isinstance(k, (int, float, np.number)) and not isinstance(k, bool)}
+        others = {k: v for k, v in self.__points.items() if k not in numeric}
+        self.numeric_points = pd.Index(list(numeric.keys()), dtype=float)
+        self.numeric_codes = np.fromiter(numeric.values(), dtype=np.int64,
+            count=len(numeric))
+        self.other_points = pd.Index(list(others.keys()), dtype=object)
+        self.other_codes = np.fromiter(others.values(), dtype=np.int64,
+            count=len(others))
+
+    def transform_codes(self, values:Iterable) -> np.ndarray:
+        """
+        Description:
+        Map each element in `values` to the code of bin containing it, and
+        -1 for elements in no bins.
+        1. Intervals: `np.searchsorted` over closed starts
+        2. Points: hash lookup with `pd.Index.get_indexer`
+        3. Missing values: `nan_code`
+
+        Params:
+        values: array-like
+
+        Return:
+        codes with the same length of `values`
+        """
+        values = values.to_numpy() if isinstance(values, pd.Series) \
+            else np.asarray(values)
+        codes = np.full(len(values), -1, dtype=np.int64)
+
+        # Numeric view of `values`, with `nan` for the non-numeric
+        if values.dtype.kind in "biuf":
+            nums = values.astype(float, copy=False)
+        else:
+            nums = pd.to_numeric(pd.Series(values), errors="coerce") \
+                .to_numpy(dtype=float)
+
+        if len(self.starts):
+            idx = np.searchsorted(self.starts, nums, side="right") - 1
+            hit = (idx >= 0) & (nums <= self.ends[np.maximum(idx, 0)])
+            codes[hit] = self.codes[idx[hit]]
+
+        if len(self.numeric_points):
+            pidx = self.numeric_points.get_indexer(nums)
+            found = pidx >= 0
+            codes[found] = self.numeric_codes[pidx[found]]
+        if len(self.other_points) and values.dtype.kind == "O":
+            pidx = self.other_points.get_indexer(values)
+            found = pidx >= 0
+            codes[found] = self.other_codes[pidx[found]]
+
+        if self.nan_code >= 0:
+            codes[pd.isna(values)] = self.nan_code
+        return codes
+
+    def transform(self, values:Iterable) -> Union[pd.Series, pd.Categorical]:
+        """
+        Description:
+        Map `values` to bins as categorical.
+
+        Params:
+        values: series or array-like
+
+        Return:
+        categorical series if `values` is series, else categorical
+        """
+        cats = pd.Categorical.from_codes(
+            self.transform_codes(values),
+            categories=pd.Index(self.categories, dtype=object)
+        )
+        if isinstance(values, pd.Series):
+            return pd.Series(cats, index=values.index, name=values.name)
+        return cats
+
+
+# %%
+class Box(Container):
+    # No `__dict__` for each instance
+    __slots__ = ("intervals", )
+
+    def __init__(self, *intervals:Interval) -> None:
+        """
+        Description:
+        N-dimensional box, A.K.A. cartesian product of intervals in each
+        dimension, like `[18, 35) x (0, 5000]` for age and income.
+
+        Params:
+        intervals: Interval for each dimension
+
+        Return:
+        """
+        self.intervals = tuple(intervals)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.intervals)
+
+    def __contains__(self, point:Iterable) -> bool:
+        """
+        Description:
+        Check if `point` with one coordinate for each dimension is in
+        `self`, with edges compared exactly.
+        """
+        for ele, itvl in zip(point, self.intervals):
+            if not ((itvl.left < ele or (itvl.including_left and itvl.left == ele))
+                    and (ele < itvl.right
+                        or (itvl.including_right and ele == itvl.right))):
+                return False
+        return True
+
+    def __eq__(self, other:Any) -> bool:
+        return issubclass(type(other), Box) and \
+            all(itvl == other_itvl for itvl, other_itvl
+                in zip(self.intervals, other.intervals))
+
+    def __repr__(self) -> str:
+        return " x ".join([repr(itvl) for itvl in self.intervals])
+
+
+def _grid_boxes(kept:np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Description:
+    Merge cells kept in grid into disjoint boxes.
+    1. Start with each cell kept as a box
+    2. For each axis from the last, merge boxes adjacent along the axis
+       and sharing the same ranges in other axes
+
+    Params:
+    kept: bool grid with shape (n_cells_0, n_cells_1, ...)
+
+    Return:
+    lo, hi: cell index ranges `[lo, hi)` of boxes with shape (n_boxes, ndim)
+    """
+    lo = np.argwhere(kept)
+    hi = lo + 1
+    ndim = kept.ndim
+    for axis in range(ndim - 1, -1, -1):
+        if len(lo) <= 1:
+            break
+        others = [edge[:, ax] for ax in range(ndim) if ax != axis
+            for edge in (lo, hi)]
+        order = np.lexsort((lo[:, axis], *others))
+        lo, hi = lo[order], hi[order]
+        same = np.ones(len(lo) - 1, dtype=bool)
+        for ax in range(ndim):
+            if ax == axis:
+                same &= hi[:-1, ax] == lo[1:, ax]
+            else:
+                same &= (lo[:-1, ax] == lo[1:, ax]) & (hi[:-1, ax] == hi[1:, ax])
+        starts = np.flatnonzero(np.concatenate([[True], ~same]))
+        ends = np.concatenate([starts[1:] - 1, [len(lo) - 1]])
+        merged_hi = hi[starts]
+        merged_hi[:, axis] = hi[ends, axis]
+        lo, hi = lo[starts], merged_hi
+    return lo, hi
+
+
+def _box_sweep(operands:list, predicate:Callable) -> Tuple[np.ndarray, ...]:
+    """
+    Description:
+    Split the space into grid cells with edges of all boxes in `operands`,
+    and keep the cells where `predicate` holds.
+    1. Convert edges into half-open keys and get unique keys in each axis
+    2. Count coverage of each operand in each cell with n-dimensional
+       difference array and cumsum along each axis
+    3. Apply `predicate` on coverage and merge cells kept into boxes
+
+    Params:
+    operands: [BoxSet, ] with the same number of dimensions
+    predicate: callable accepting bool array with shape
+        (n_cells_0, n_cells_1, ..., n_operands) and returning bool grid,
+        which must be False if no operand covers the cell
+
+    Return:
+    left, right, including_left, including_right with shape (n_boxes, ndim)
+    """
+    ndim = max(bset.ndim for bset in operands)
+    starts, ends, ops = [], [], []
+    for bset in operands:
+        if not len(bset):
+            bset = BoxSet(np.empty((0, ndim)), np.empty((0, ndim)))
+        start, end = _edge_keys(
+            bset.left,
+            bset.right,
+            bset.including_left,
+            bset.including_right
+        )
+        # Drop null boxes, nan edges included
+        valid = (start < end).all(axis=1)
+        starts.append(start[valid])
+        ends.append(end[valid])
+        ops.append((bset.left[valid], bset.right[valid],
+            bset.including_left[valid], bset.including_right[valid]))
+
+    empty = np.empty((0, ndim))
+    if sum(len(start) for start in starts) == 0:
+        return empty, empty.copy(), empty.astype(bool), empty.astype(bool)
+
+    # Unique keys, with the edge and closedness they come from, in each axis
+    ukeys, uedges, ushifted = [], [], []
+    for axis in range(ndim):
+        keys = np.concatenate([*[start[:, axis] for start in starts],
+            *[end[:, axis] for end in ends]])
+        edges = np.concatenate([*[op[0][:, axis] for op in ops],
+            *[op[1][:, axis] for op in ops]])
+        shifted = np.concatenate([*[~op[2][:, axis] for op in ops],
+            *[op[3][:, axis] for op in ops]])
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        is_new = np.concatenate([[True], keys[1:] != keys[:-1]])
+        ukeys.append(keys[is_new])
+        uedges.append(edges[order][is_new])
+        ushifted.append(shifted[order][is_new])
+
+    # Coverage of each operand in each cell
+    shape = tuple(len(keys) for keys in ukeys)
+    coverage = []
+    for start, end in zip(starts, ends):
+        lo = [np.searchsorted(ukeys[axis], start[:, axis]) for axis in range(ndim)]
+        hi = [np.searchsorted(ukeys[axis], end[:, axis]) for axis in range(ndim)]
+        diff = np.zeros(shape, dtype=np.int64)
+        # Add 1 or -1 at each corner of boxes
+        for corner in range(2 ** ndim):
+            idx = tuple(hi[axis] if corner >> axis & 1 else lo[axis]
+                for axis in range(ndim))
+            sign = -1 if bin(corner).count("1") % 2 else 1
+            np.add.at(diff, idx, sign)
+        for axis in range(ndim):
+            diff = diff.cumsum(axis=axis)
+        coverage.append(diff[tuple(slice(0, -1) for _ in range(ndim))] > 0)
+    kept = predicate(np.stack(coverage, axis=-1))
+
+    lo, hi = _grid_boxes(kept)
+    left = np.stack([uedges[axis][lo[:, axis]] for axis in range(ndim)], axis=1)
+    right = np.stack([uedges[axis][hi[:, axis]] for axis in range(ndim)], axis=1)
+    including_left = np.stack([~ushifted[axis][lo[:, axis]]
+        for axis in range(ndim)], axis=1)
+    including_right = np.stack([ushifted[axis][hi[:, axis]]
+        for axis in range(ndim)], axis=1)
+    return (left.reshape(-1, ndim), right.reshape(-1, ndim),
+        including_left.reshape(-1, ndim), including_right.reshape(-1, ndim))
+
+
+class BoxSet(Sized, Iterable):
+    # Cells of the lookup table grow as (2 * n_boxes) ** ndim, and `locate`
+    # will fall back to `IntervalTree` above this size
+    max_table_size = 2 ** 22
+
+    def __init__(
+        self,
+        left:Iterable,
+        right:Iterable,
+        including_left:Union[bool, Iterable]=True,
+        including_right:Union[bool, Iterable]=False
+    ) -> None:
+        """
+        Description:
+        Columnar set of N-dimensional boxes, with edges of each dimension
+        stored in columns of `left` and `right`.
+        1. Boxes are kept in the order given, so that `locate` returns
+           the index of box just like the id of segment
+        2. Union, difference and intersection return disjoint boxes from
+           grid sweeps
+
+        Params:
+        left: left edges with shape (n_boxes, ndim)
+        right: right edges with shape (n_boxes, ndim)
+        including_left: bool or bools broadcastable to `left`
+        including_right: bool or bools broadcastable to `right`
+
+        Return:
+        """
+        self.left = self.__as_edges(left)
+        self.right = self.__as_edges(right)
+        self.including_left = np.broadcast_to(
+            np.asarray(including_left, dtype=bool), self.left.shape).copy()
+        self.including_right = np.broadcast_to(
+            np.asarray(including_right, dtype=bool), self.right.shape).copy()
+        # Lookup table or tree for `locate`, which will be built lazily
+        self._table = None
+        self._tree = None
+
+    @staticmethod
+    def __as_edges(edges:Iterable) -> np.ndarray:
+        """
+        Description:
+        Reshape edges into 2-D array, (n_boxes, ndim).
+        """
+        edges = np.asarray(edges, dtype=float)
+        if edges.size == 0:
+            return edges.reshape(0, edges.shape[-1] if edges.ndim > 1 else 0)
+        return edges.reshape(-1, edges.shape[-1])
+
+    @property
+    def ndim(self) -> int:
+        return self.left.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+    def __iter__(self) -> Iterator:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __getitem__(self, key:Any) -> Union[Box, BoxSet]:
+        """
+        Description:
+        1. `key`: int -> `Box`
+        2. `key`: slice, bool array, etc -> `BoxSet`
+        """
+        if isinstance(key, (int, np.integer)):
+            return Box(*[Interval(*edges) for edges in zip(
+                self.left[key].tolist(),
+                self.right[key].tolist(),
+                self.including_left[key].tolist(),
+                self.including_right[key].tolist()
+            )])
+        return self.__class__(
+            self.left[key],
+            self.right[key],
+            self.including_left[key],
+            self.including_right[key]
+        )
+
+    def __repr__(self) -> str:
+        return f"{{{', '.join([repr(box) for box in self])}}}"
+
+    def __add__(self, other:Any) -> BoxSet:
+        return self.union(other)
+
+    def __sub__(self, other:Any) -> BoxSet:
+        return self.difference(other)
+
+    def __and__(self, other:Any) -> BoxSet:
+        return self.intersection(other)
+
+    def union(self, *others:Any) -> BoxSet:
+        """
+        Description:
+        Union `self` with `others` in one grid sweep.
+        """
+        operands = [self, *[self.__class__.from_any(other) for other in others]]
+        return self.__class__(*_box_sweep(operands, lambda cov: cov.any(axis=-1)))
+
+    def difference(self, other:Any) -> BoxSet:
+        """
+        Description:
+        Get the elements in `self` but not in `other`.
+        """
+        operands = [self, self.__class__.from_any(other)]
+        return self.__class__(
+            *_box_sweep(operands, lambda cov: cov[..., 0] & ~cov[..., 1])
+        )
+
+    def intersection(self, other:Any) -> BoxSet:
+        """
+        Description:
+        Get the elements in both `self` and `other`.
+        """
+        operands = [self, self.__class__.from_any(other)]
+        return self.__class__(
+            *_box_sweep(operands, lambda cov: cov[..., 0] & cov[..., 1])
+        )
+
+    def __build_table(self) -> None:
+        """
+        Description:
+        Build grid of box ids with unique keys of edges in each axis, in
+        which each cell is filled with the first box containing it.
+        1. Grid with more than `max_table_size` cells won't be built, and
+           `IntervalTree` will be built on the axis with most keys instead
+        """
+        start, end = _edge_keys(
+            self.left,
+            self.right,
+            self.including_left,
+            self.including_right
+        )
+        keys = [np.unique(np.concatenate([start[:, axis], end[:, axis]]))
+            for axis in range(self.ndim)]
+        shape = tuple(max(len(key) - 1, 0) for key in keys)
+        # Product of Python ints won't overflow
+        if np.prod(shape, dtype=object) > self.max_table_size:
+            axis = int(np.argmax([len(key) for key in keys]))
+            self._tree = axis, IntervalTree(
+                self.left[:, axis],
+                self.right[:, axis],
+                self.including_left[:, axis],
+                self.including_right[:, axis]
+            ), start, end
+            self._table = keys, None
+            return
+        table = np.full(shape, -1, dtype=np.int64)
+        lo = [np.searchsorted(keys[axis], start[:, axis]) for axis in range(self.ndim)]
+        hi = [np.searchsorted(keys[axis], end[:, axis]) for axis in range(self.ndim)]
+        # Fill in reverse order, so the first box wins if boxes overlap
+        for bid in range(len(self) - 1, -1, -1):
+            table[tuple(slice(lo[axis][bid], hi[axis][bid])
+                for axis in range(self.ndim))] = bid
+        self._table = keys, table
+
+    def locate(self, points:Iterable) -> np.ndarray:
+        """
+        Description:
+        Locate the box containing each point in one vectorized pass.
+        1. Locate the cell in each axis with `np.searchsorted` over unique
+           keys of edges
+        2. Combine cell indices in each axis into one code
+        3. Look up the box id of the code in the grid
+
+        P.S.
+        If the grid is too large, boxes containing each point will be
+        stabbed with `IntervalTree` on one axis, and then checked on the
+        other axes.
+
+        Params:
+        points: array-like with shape (n_points, ndim)
+
+        Return:
+        int array with shape (n_points, ), the index of box containing the
+        point, or -1 if no box contains it
+        """
+        points = np.asarray(points, dtype=float)
+        points = points.reshape(-1, points.shape[-1] if points.ndim else 1)
+        if not len(self):
+            return np.full(len(points), -1, dtype=np.int64)
+        if self._table is None:
+            self.__build_table()
+        keys, table = self._table
+        if table is None:
+            return self.__locate_with_tree(points)
+        # All boxes are null
+        if table.size == 0:
+            return np.full(len(points), -1, dtype=np.int64)
+
+        valid = np.ones(len(points), dtype=bool)
+        cells = []
+        for axis in range(self.ndim):
+            cell = np.searchsorted(keys[axis], points[:, axis], side="right") - 1
+            # `nan` is sorted after all keys, and will be invalid too
+            valid &= (cell >= 0) & (cell < table.shape[axis])
+            cells.append(cell)
+        code = np.ravel_multi_index(
+            [np.where(valid, cell, 0) for cell in cells], table.shape)
+        return np.where(valid, table.ravel()[code], -1)
+
+    def __locate_with_tree(self, points:np.ndarray) -> np.ndarray:
+        """
+        Description:
+        Locate points with `IntervalTree` on one axis, and only boxes
+        stabbed will be checked on all axes.
+        """
+        axis, tree, start, end = self._tree
+        qidx, ids = tree.stab(points[:, axis])
+        stabbed = points[qidx]
+        hit = ((start[ids] <= stabbed) & (stabbed < end[ids])).all(axis=1)
+        # The first box wins if boxes overlap, just like the grid
+        located = np.full(len(points), len(self), dtype=np.int64)
+        np.minimum.at(located, qidx[hit], ids[hit])
+        return np.where(located < len(self), located, -1)
+
+    def contains_array(self, points:Iterable) -> np.ndarray:
+        """
+        Description:
+        Check if each point is contained in any box in `self`.
+        """
+        return self.locate(points) >= 0
+
+    @classmethod
+    def from_boxes(cls, boxes:Iterable) -> BoxSet:
+        """
+        Description:
+        Create `BoxSet` from boxes.
+
+        Params:
+        boxes: [Box, ] or [[Interval for each dimension], ]
+
+        Return:
+        BoxSet
+        """
+        itvls = [box.intervals if issubclass(type(box), Box) else tuple(box)
+            for box in boxes]
+        return cls(
+            [[itvl.left for itvl in box] for box in itvls],
+            [[itvl.right for itvl in box] for box in itvls],
+            [[itvl.including_left for itvl in box] for box in itvls],
+            [[itvl.including_right for itvl in box] for box in itvls]
+        )
+
+    @classmethod
+    def from_any(cls, other:Any) -> BoxSet:
+        """
+        Description:
+        Convert `other` into `BoxSet`
+        1. `other`: BoxSet -> return directly
+        2. `other`: Box -> `from_boxes([other])`
+        3. `other`: [Box, ] -> `from_boxes`
+        """
+        if issubclass(type(other), cls):
+            return other
+        elif issubclass(type(other), Box):
+            return cls.from_boxes([other])
+        else:
+            return cls.from_boxes(other)
+
+
 # %%
 if __name__ == "__main__":
     a = Interval(1, 2)
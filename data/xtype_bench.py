@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+#----------------------------------------------------------
+#   Name: xtype_bench.py
+#   Author: xyy15926
+#   Created at: 2026-10-18 10:12:36
+#   Updated at: 2026-10-18 10:12:36
+#   Description: benchmarks for interval algebra in `xtype`,
+#     run with `python -m <package>.data.xtype_bench`
+#----------------------------------------------------------
+
+# %%
+from __future__ import annotations
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from collections.abc import (Callable, )
+from typing import (Union, Tuple, )
+import numpy as np
+from .xtype import (Interval, Value)
+
+# Sizes from 10^2 to 10^6
+SIZES = [10 ** exp for exp in range(2, 7)]
+
+# %%
+def random_intervals(
+    n:int,
+    seed:int=0,
+    span:float=1e4
+) -> list:
+    """
+    Description:
+    Generate `n` random intervals with random closedness, whose left
+    edges are uniform in `[0, span * n)` and lengths are uniform in
+    `[0, span)`, so that about half of them overlap with neighbours.
+
+    Params:
+    n: number of intervals
+    seed: random seed
+    span: scale of edges
+
+    Return:
+    [Interval, ]
+    """
+    rng = np.random.default_rng(seed)
+    left = rng.uniform(0, span * n, n)
+    right = left + rng.uniform(0, span, n)
+    flags = rng.random((n, 2)) > 0.5
+    return [Interval(*edges) for edges in zip(
+        left.tolist(),
+        right.tolist(),
+        flags[:, 0].tolist(),
+        flags[:, 1].tolist()
+    )]
+
+
+def random_points(n:int, seed:int=0, span:float=1e4) -> list:
+    """
+    Description:
+    Generate `n` random points in the same range of `random_intervals`.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, span * n, n).tolist()
+
+
+def operations(n:int) -> dict:
+    """
+    Description:
+    Prepare inputs for each operation with `n` intervals or points, and
+    return closures to be measured.
+
+    Params:
+    n
+
+    Return:
+    {operation name: callable without parameters}
+    """
+    itvls, others = random_intervals(n, 0), random_intervals(n, 1)
+    points = random_points(n, 2)
+    trimmed = Interval.trim_intervals(itvls)
+    sorted_points = sorted(points)
+    value, other_value = Value(itvls), Value([*others, *points])
+    queries = np.asarray(random_points(n, 3))
+    iset = value.to_interval_set()
+
+    return {
+        "trim_intervals": lambda: Interval.trim_intervals(itvls),
+        "intervals_diff_intervals": lambda: Interval.intervals_diff_intervals(
+            itvls, others),
+        "intervals_union_sized": lambda: Interval.intervals_union_sized(
+            trimmed, sorted_points, True),
+        "complement_intervals": lambda: Interval.complement_intervals(
+            trimmed, True),
+        "Value.__add__": lambda: value + other_value,
+        "Value.__sub__": lambda: value - other_value,
+        "Value.contains_array": lambda: value.contains_array(queries),
+        "IntervalSet.contains_array": lambda: iset.contains_array(queries),
+    }
+
+
+def measure(func:Callable, repeat:int=3) -> Tuple[float, int]:
+    """
+    Description:
+    Measure `func`.
+    1. Time: the best of `repeat` runs with `time.perf_counter`
+    2. Peak memory: peak of memory allocated during one extra run traced
+       by `tracemalloc`, which is excluded from timing for its overhead
+
+    Params:
+    func
+    repeat
+
+    Return:
+    seconds, bytes
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak - base
+
+
+def run(
+    sizes:list=SIZES,
+    ops:Union[list, None]=None,
+    repeat:int=3
+) -> list:
+    """
+    Description:
+    Run benchmarks for each size and operation.
+
+    Params:
+    sizes: [n, ]
+    ops: names of operations to run, all operations if None
+    repeat: number of runs for timing
+
+    Return:
+    [{"operation": , "n": , "seconds": , "peak_bytes": }, ]
+    """
+    results = []
+    for n in sizes:
+        for name, func in operations(n).items():
+            if ops is not None and name not in ops:
+                continue
+            seconds, peak = measure(func, repeat)
+            results.append({
+                "operation": name,
+                "n": n,
+                "seconds": seconds,
+                "peak_bytes": peak,
+            })
+    return results
+
+
+# %%
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark `xtype` operations.")
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=SIZES,
+        help="numbers of intervals and points")
+    parser.add_argument("-o", "--ops", nargs="+", default=None,
+        help="names of operations, all by default")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+        help="number of runs for timing")
+    parser.add_argument("--output", default=None,
+        help="file to write JSON into, stdout by default")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.ops, args.repeat)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
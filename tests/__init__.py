@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+#----------------------------------------------------------
+#   Name: __init__.py
+#   Author: xyy15926
+#   Created at: 2026-10-18 14:20:03
+#   Updated at: 2026-10-18 14:20:03
+#   Description: tests run with `python -m pytest` in the
+#     directory containing the package
+#----------------------------------------------------------
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+#----------------------------------------------------------
+#   Name: test_converter.py
+#   Author: xyy15926
+#   Created at: 2026-10-18 15:12:46
+#   Updated at: 2026-10-18 15:12:46
+#   Description:
+#----------------------------------------------------------
+
+# %%
+import numpy as np
+import pandas as pd
+from ..data.dtyper import converter, dtyper
+
+
+# %%
+def test_categorize_frame_parallel_matches_serial():
+    rng = np.random.default_rng(7)
+    n = 400
+    tgt = pd.Series(rng.integers(0, 2, n), index=np.arange(n) * 2)
+    df = pd.DataFrame({
+        "num": tgt * 50 + rng.random(n) * 60,
+        "cat": rng.choice(list("abc"), n),
+        "int": rng.integers(0, 4, n),
+    }, index=tgt.index)
+
+    serial = converter.categorize_frame(df, tgt, n_jobs=1)
+    parallel = converter.categorize_frame(df, tgt, n_jobs=2)
+    assert list(serial) == list(parallel) == list(df.columns)
+    for col in df.columns:
+        woes, categorized = serial[col]
+        assert woes is not None and len(woes) > 1
+        pd.testing.assert_frame_equal(woes, parallel[col][0])
+        pd.testing.assert_series_equal(categorized, parallel[col][1])
+        assert categorized.index.equals(df.index)
+
+
+def test_convert_series_dtype_sample_str_dtype():
+    dt = pd.Series([str(ele) for ele in range(1000)], name="num")
+    converted, type_ = converter.convert_series_dtype(dt, sample=True)
+    assert type_ is int
+    assert converted.dtype.kind == "i"
+    assert converted.tolist() == list(range(1000))
+
+
+def test_convert_series_dtype_sample_large_ids():
+    ids = [str(6222021234567890123 + ele * 2) for ele in range(1000)]
+    converted, type_ = converter.convert_series_dtype(
+        pd.Series(ids, dtype=object), sample=True)
+    assert type_ is int
+    assert converted.dtype == np.int64
+    assert converted.tolist() == [int(ele) for ele in ids]
+
+
+def test_convert_series_dtype_datetime_with_format_cached():
+    days = ["2020/01/02", None, "2021/03/04"]
+    converted, type_ = converter.convert_series_dtype(
+        pd.Series(days, name="day", dtype=object), schema="first")
+    assert type_ is pd.Timestamp
+    assert converted.dtype.kind == "M"
+    assert converted.isna().tolist() == [False, True, False]
+    assert converted[2] == pd.Timestamp(2021, 3, 4)
+    assert dtyper.DATETIME_FORMAT_CACHE[("first", "day")] == "%Y/%m/%d"
+
+    # Series with values not parsed is kept
+    days = pd.Series(["2020/01/02", "nope"], name="day", dtype=object)
+    converted, type_ = converter.convert_series_dtype(days, schema="second")
+    assert converted.tolist() == days.tolist()
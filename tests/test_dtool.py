@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+#----------------------------------------------------------
+#   Name: test_dtool.py
+#   Author: xyy15926
+#   Created at: 2026-10-18 14:33:52
+#   Updated at: 2026-10-18 14:33:52
+#   Description:
+#----------------------------------------------------------
+
+# %%
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from ..data.pdtools import dtool
+
+
+# %%
+def test_tree_spliter_matches_cut():
+    rng = np.random.default_rng(8)
+    n = 600
+    tgt = pd.Series(rng.integers(0, 2, n))
+    dt = tgt * 2 + rng.random(n) * 3
+    dt[rng.choice(n, 30, replace=False)] = np.nan
+    dt[rng.choice(n, 20, replace=False)] = -999
+    clf = DecisionTreeClassifier(max_leaf_nodes=4, min_samples_leaf=0.1,
+        random_state=0)
+
+    cut_dt, cats = dtool.tree_spliter(dt, tgt, predef=[-999], clf=clf)
+    stops = sorted(clf.tree_.threshold[
+        clf.tree_.children_left != clf.tree_.children_right])
+    valid = dt.notna() & (dt != -999)
+    stops = [dt[valid].min(), *stops, dt[valid].max()]
+    expected = pd.cut(dt, stops, include_lowest=True)
+    assert (cut_dt[valid].cat.codes == expected[valid].cat.codes).all()
+    assert cut_dt[dt.isna()].eq("nan").all()
+    assert cut_dt[dt == -999].eq(-999).all()
+    assert cats[-2:] == ["nan", -999]
+
+
+def test_tree_spliter_labels_match_cut():
+    rng = np.random.default_rng(9)
+    n = 500
+    tgt = pd.Series(rng.integers(0, 2, n))
+    dt = tgt * 2 + rng.random(n) * 3
+    dt[rng.choice(n, 20, replace=False)] = np.nan
+    clf = DecisionTreeClassifier(max_leaf_nodes=4, min_samples_leaf=0.1,
+        random_state=0)
+
+    cut_dt, cats = dtool.tree_spliter(dt, tgt, predef=[-999], clf=clf)
+    stops = sorted(clf.tree_.threshold[
+        clf.tree_.children_left != clf.tree_.children_right])
+    stops = [dt.min(), *stops, dt.max()]
+    expected = pd.cut(dt, stops, include_lowest=True) \
+        .cat.add_categories(["nan", -999])
+    assert cats == expected.cat.categories.to_list()
+    valid = dt.notna()
+    assert cut_dt[valid].astype(object).equals(expected[valid].astype(object))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+#----------------------------------------------------------
+#   Name: test_dtyper.py
+#   Author: xyy15926
+#   Created at: 2026-10-18 14:41:27
+#   Updated at: 2026-10-18 14:41:27
+#   Description:
+#----------------------------------------------------------
+
+# %%
+import pytest
+import numpy as np
+import pandas as pd
+from ..data.dtyper import dtyper
+
+
+# %%
+def test_parse_range_series_matches_convert_type():
+    strs = [">10", "大于10", "<5", "小于5.5", "10至20", "10到20之间", "abc",
+        "12", "3.5~4", None, 7, ">10", "<5"]
+    expected = []
+    for ele in strs:
+        try:
+            expected.append(dtyper.convert_type(ele, tgt="float"))
+        except Exception:
+            expected.append(np.nan)
+    itvls = dtyper.parse_range_series(pd.Series(strs, dtype=object))
+    assert len(itvls) == len(strs)
+    for itvl, exp in zip(itvls, expected):
+        if isinstance(exp, pd.Interval):
+            assert itvl == exp
+        else:
+            assert pd.isna(itvl)
+
+    itvls = dtyper.parse_range_series(pd.Series(["10-20", "-5--3"]))
+    assert list(itvls) == [pd.Interval(10.0, 20.0), pd.Interval(-5.0, -3.0)]
+    iset = dtyper.parse_range_series(pd.Series(strs, dtype=object), how="set")
+    assert list(iset.left) == [-np.inf, 10]
+    assert list(iset.right) == [5.5, np.inf]
+
+
+def test_optimize_frame_nullable_and_duplicates():
+    df = pd.DataFrame([[1, 2.5, 300], [2, None, 4]], columns=["a", "b", "a"])
+    df["n"] = pd.array([-1, None], dtype="Int64")
+    opt, report = dtyper.optimize_frame(df)
+    assert list(opt.columns) == ["a", "b", "a", "n"]
+    assert [str(dtype) for dtype in opt.dtypes] \
+        == ["uint8", "float32", "uint16", "Int8"]
+    assert opt["n"].isna().tolist() == [False, True]
+    assert list(report.index) == ["a", "b", "a", "n"]
+
+
+def test_pdidx_set_labels():
+    dt = pd.Series([1, 2], index=[frozenset([1, 2]), frozenset([3])])
+    assert dtyper.pdidx(dt, frozenset([2, 1])) == 1
+    assert dtyper.pdidx(dt, {3}) == 2
+    with pytest.raises(ValueError):
+        dtyper.pdidx(dt, frozenset([4]))
+    with pytest.raises(ValueError):
+        dtyper.pdidx(dt, {4})
+
+
+def test_datetime_formats_cached_per_schema():
+    slash = pd.Series(["2020/01/02", "2021/03/04"], name="day", dtype=object)
+    dash = pd.Series(["2020-01-02", "2021-03-04"], name="day", dtype=object)
+    dtyper.convert_series_type(slash, "datetime64", schema="slash")
+    dtyper.convert_series_type(dash, "datetime64", schema="dash")
+    assert dtyper.DATETIME_FORMAT_CACHE[("slash", "day")] == "%Y/%m/%d"
+    assert dtyper.DATETIME_FORMAT_CACHE[("dash", "day")] == "%Y-%m-%d"
+
+
+def test_convert_series_type_large_ints():
+    ids = ["6222021234567890123", "6222021234567890125", "nan"]
+    converted = dtyper.convert_series_type(pd.Series(ids, dtype=object), "int")
+    assert str(converted.dtype) == "Int64"
+    assert converted.isna().tolist() == [False, False, True]
+    assert converted[:2].tolist() == [6222021234567890123, 6222021234567890125]
+    converted = dtyper.convert_series_type(pd.Series(ids[:2], dtype=object), "int")
+    assert converted.dtype == np.int64
+    assert converted.tolist() == [6222021234567890123, 6222021234567890125]
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+#----------------------------------------------------------
+#   Name: test_xtype.py
+#   Author: xyy15926
+#   Created at: 2026-10-18 14:20:03
+#   Updated at: 2026-10-18 14:20:03
+#   Description:
+#----------------------------------------------------------
+
+# %%
+import pytest
+import numpy as np
+import pandas as pd
+from ..data.xtype import (Interval, IntervalSet, _sweep, IntervalTree, Value,
+    Discretizer, DatetimeIntervalSet, BoxSet, parse_intervals, _SortedBlocks)
+
+
+# %%
+def edges(itvls:list) -> list:
+    return [(itvl.left, itvl.right, itvl.including_left, itvl.including_right)
+        for itvl in itvls]
+
+
+def copies(itvls:list) -> list:
+    return [itvl.copy() for itvl in itvls]
+
+
+def random_intervals(rng:np.random.Generator, n:int, high:int=40) -> list:
+    left = rng.integers(0, high, n)
+    width = rng.integers(1, 6, n)
+    closed = rng.integers(0, 2, (n, 2)).astype(bool)
+    return [Interval(int(lo), int(lo + wd), bool(cl), bool(cr))
+        for lo, wd, (cl, cr) in zip(left, width, closed)]
+
+
+def test_interval_set_matches_interval_lists():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        lhs, rhs = random_intervals(rng, 8), random_intervals(rng, 8)
+        ltrimmed = Interval.trim_intervals(copies(lhs))
+        rtrimmed = Interval.trim_intervals(copies(rhs))
+        diff = Interval.intervals_diff_intervals(copies(ltrimmed),
+            copies(rtrimmed))
+        lset = IntervalSet.from_intervals(lhs)
+        rset = IntervalSet.from_intervals(rhs)
+        assert edges(lset) == edges(ltrimmed)
+        assert edges(lset.union(rset)) \
+            == edges(Interval.trim_intervals(copies(lhs + rhs)))
+        assert edges(lset.difference(rset)) \
+            == edges(Interval.trim_intervals(copies(diff)))
+        assert edges(lset.intersection(rset)) \
+            == edges(Interval.trim_intervals(Interval.intervals_diff_intervals(
+                copies(ltrimmed), copies(diff))))
+        assert edges(lset.complement()) \
+            == edges(Interval.complement_intervals(copies(ltrimmed)))
+
+
+def test_interval_set_points():
+    iset = IntervalSet.from_intervals(
+        [Interval(1, 3), 3, 5, Interval(5, 7, False), 9])
+    assert edges(iset) == [(1, 3, True, True), (5, 7, True, False),
+        (9, 9, True, True)]
+    assert edges(iset.difference([Interval(2, 5, False, False)])) \
+        == [(1, 2, True, True), (5, 7, True, False), (9, 9, True, True)]
+
+
+def test_sweep_symmetric_difference():
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        lhs, rhs = random_intervals(rng, 8), random_intervals(rng, 8)
+        ltrimmed = Interval.trim_intervals(copies(lhs))
+        rtrimmed = Interval.trim_intervals(copies(rhs))
+        symdiff = Interval.trim_intervals(
+            Interval.intervals_diff_intervals(copies(ltrimmed), copies(rtrimmed))
+            + Interval.intervals_diff_intervals(copies(rtrimmed), copies(ltrimmed))
+        )
+        operands = [IntervalSet.from_intervals(lhs),
+            IntervalSet.from_intervals(rhs)]
+        swept = _sweep(operands, lambda cov: cov[:, 0] != cov[:, 1], True)
+        assert edges(IntervalSet.from_raw(*swept)) == edges(symdiff)
+        swept = _sweep(operands, lambda cov: cov == 1)
+        assert edges(IntervalSet.from_raw(*swept)) == edges(symdiff)
+
+
+def contained(itvls:list, grid:np.ndarray) -> np.ndarray:
+    return np.array([np.zeros(len(grid), dtype=bool) if itvl is None
+        else itvl.contains_array(grid) for itvl in itvls])
+
+
+def test_interval_tree_matches_interval_lists():
+    rng = np.random.default_rng(4)
+    grid = np.arange(-1, 48, 0.5)
+    itvls = random_intervals(rng, 100) \
+        + [Interval(ele, ele, True, True) for ele in range(0, 40, 7)]
+    queries = random_intervals(rng, 30)
+    qleft, qright, qinc_left, qinc_right = map(np.asarray, zip(*edges(queries)))
+    tree = IntervalTree.from_intervals(itvls)
+
+    def check():
+        inside = contained(itvls, grid)
+        stabbed = np.column_stack(tree.stab(grid)).tolist()
+        assert stabbed == np.argwhere(inside.T).tolist()
+        qinside = contained(queries, grid).astype(int)
+        overlapped = (qinside @ inside.T.astype(int)) > 0
+        found = tree.overlap(qleft, qright, qinc_left, qinc_right)
+        assert np.column_stack(found).tolist() == np.argwhere(overlapped).tolist()
+
+    check()
+    # Deleting more than half of intervals rebuilds the tree
+    for iid in rng.choice(len(itvls), 60, replace=False).tolist():
+        tree.delete(iid)
+        itvls[iid] = None
+        with pytest.raises(KeyError):
+            tree.delete(iid)
+    check()
+    # Inserting more than the intervals alive rebuilds the tree too
+    for itvl in random_intervals(rng, 80):
+        assert tree.insert(itvl) == len(itvls)
+        itvls.append(itvl)
+    check()
+
+
+def test_lazy_intervals_match_interval_lists():
+    rng = np.random.default_rng(6)
+    for _ in range(30):
+        lists = [random_intervals(rng, 6) for _ in range(4)]
+        a, b, c, d = [IntervalSet.from_intervals(itvls) for itvls in lists]
+        union = Interval.trim_intervals(copies(lists[0] + lists[1]))
+        diff = Interval.intervals_diff_intervals(union, copies(lists[2]))
+        expected = Interval.intervals_diff_intervals(copies(diff),
+            Interval.intervals_diff_intervals(copies(diff), copies(lists[3])))
+        lazy = (a.lazy() + b - c) & d
+        assert edges(lazy.evaluate()) \
+            == edges(Interval.trim_intervals(expected))
+        assert edges((a.lazy() + b + c + d).evaluate()) == edges(
+            Interval.trim_intervals(copies(sum(lists, []))))
+
+
+def test_lazy_intervals_long_chain():
+    rng = np.random.default_rng(16)
+    itvls = random_intervals(rng, 2000, high=400)
+    lazy = IntervalSet.from_intervals(itvls[:1]).lazy()
+    for itvl in itvls[1:]:
+        lazy = lazy + IntervalSet.from_intervals([itvl])
+    assert edges(lazy.evaluate()) \
+        == edges(Interval.trim_intervals(copies(itvls)))
+
+
+def test_value_updates_match_interval_set():
+    rng = np.random.default_rng(7)
+    value, expected = Value([]), IntervalSet()
+    for itvl in random_intervals(rng, 200):
+        point = int(rng.integers(0, 45))
+        if rng.random() < 0.5:
+            value.add_interval(itvl.copy())
+            value.add_point(point)
+            expected = expected.union([itvl, point])
+        else:
+            value.discard_interval(itvl.copy())
+            value.discard_point(point)
+            expected = expected.difference([itvl, point])
+        assert IntervalSet.from_any(value) == expected
+
+
+def test_discretizer_matches_interval_lists():
+    bins = [
+        [Interval(0, 2), Interval(8, 9, True, True)],
+        Interval(2, 5, False, True),
+        {3, 7, "x"},
+        Value([Interval(5, 7, False, False), 10]),
+        "nan",
+    ]
+    values = [-1, 0, 1.5, 2, 2.5, 3, 5, 6, 7, 8, 9, 9.5, 10, None, "x", "y"]
+    discretizer = Discretizer(bins)
+
+    def locate(val):
+        if val is None:
+            return 4
+        if val in (3, 7, "x"):
+            return 2
+        if isinstance(val, str):
+            return -1
+        for code, itvls in [(0, bins[0]), (1, [bins[1]]), (3, bins[3].intervals)]:
+            if any(itvl.contains_array(val) for itvl in itvls):
+                return code
+        return 3 if val == 10 else -1
+
+    values = pd.Series(values, dtype=object)
+    expected = [locate(val) for val in values]
+    assert discretizer.transform_codes(values).tolist() == expected
+    assert discretizer.transform_codes(values.iloc[:-3].astype(float)).tolist() \
+        == expected[:-3]
+
+
+def test_discretizer_matches_cut():
+    values = pd.Series(np.random.default_rng(8).normal(size=1000))
+    breaks = [-np.inf, -1, 0, 0.5, 2, np.inf]
+    cut = pd.cut(values, breaks)
+    transformed = Discretizer(pd.IntervalIndex.from_breaks(breaks)).transform(values)
+    assert (transformed.cat.codes == cut.cat.codes).all()
+
+
+def test_value_bytes_match_interval_lists(tmp_path):
+    rng = np.random.default_rng(10)
+    value = Value(random_intervals(rng, 50) + [41.5, 43, 44.25])
+    loaded = Value.from_bytes(value.to_bytes())
+    assert sorted(loaded.sized) == sorted(value.sized)
+    assert edges(loaded.intervals) == edges(value.intervals)
+    value.save(tmp_path / "value.bin")
+    loaded = Value.load(tmp_path / "value.bin")
+    assert sorted(loaded.sized) == sorted(value.sized)
+    assert edges(loaded.intervals) == edges(value.intervals)
+
+
+def test_interval_set_bytes_mmap(tmp_path):
+    rng = np.random.default_rng(10)
+    itvls = Interval.trim_intervals(random_intervals(rng, 500, high=2000))
+    iset = IntervalSet.from_intervals(itvls)
+    assert IntervalSet.from_bytes(iset.to_bytes()) == iset
+    iset.save(tmp_path / "iset.bin")
+    loaded = IntervalSet.load(tmp_path / "iset.bin")
+    assert isinstance(loaded.left.base, np.memmap) or \
+        isinstance(loaded.left.base.base, np.memmap)
+    assert not loaded.left.flags.writeable
+    assert edges(loaded) == edges(itvls)
+
+
+def test_sweep_kernels_match_interval_lists():
+    rng = np.random.default_rng(12)
+    for _ in range(50):
+        lhs, rhs = random_intervals(rng, 8), random_intervals(rng, 8)
+        ltrimmed = Interval.trim_intervals(copies(lhs))
+        rtrimmed = Interval.trim_intervals(copies(rhs))
+        ldiff = Interval.intervals_diff_intervals(copies(ltrimmed),
+            copies(rtrimmed))
+        rdiff = Interval.intervals_diff_intervals(copies(rtrimmed),
+            copies(ltrimmed))
+        assert edges(Interval.intervals_intersect_intervals(lhs, rhs)) == edges(
+            Interval.intervals_diff_intervals(copies(ltrimmed), ldiff))
+        assert edges(Interval.intervals_symdiff_intervals(lhs, rhs)) \
+            == edges(Interval.trim_intervals(ldiff + rdiff))
+        assert edges(Interval.complement_intervals(lhs)) == edges(
+            Interval.intervals_diff_intervals([Interval(-np.inf, np.inf,
+                False, False)], copies(ltrimmed)))
+
+
+def test_sized_kernels_match_interval_lists():
+    rng = np.random.default_rng(12)
+    grid = np.arange(-1, 48, 0.5)
+    for _ in range(50):
+        itvls = Interval.trim_intervals(random_intervals(rng, 8))
+        points = set(rng.integers(0, 46, 10).tolist())
+        inside = contained(itvls, np.asarray(sorted(points))).any(axis=0)
+        assert Interval.intervals_intersect_sized(itvls, points) \
+            == {ele for ele, ok in zip(sorted(points), inside) if ok}
+        sized, cut = Interval.intervals_symdiff_sized(itvls, points)
+        assert sized == {ele for ele, ok in zip(sorted(points), inside) if not ok}
+        expected = contained(itvls, grid).any(axis=0) & ~np.isin(grid, list(points))
+        assert (contained(cut, grid).any(axis=0) == expected).all()
+
+
+def test_interval_set_pandas_matches_interval_lists():
+    rng = np.random.default_rng(13)
+    itvls = Interval.trim_intervals(random_intervals(rng, 100, high=500))
+    iset = IntervalSet.from_intervals(itvls)
+    groups = iset.to_pandas(split=True)
+    assert sum(len(index) for index in groups.values()) == len(itvls)
+    for closed, index in groups.items():
+        expected = [pd.Interval(itvl.left, itvl.right, closed=closed)
+            for itvl in itvls
+            if pd.Interval(0, 1, closed=closed).closed_left == itvl.including_left
+            and pd.Interval(0, 1, closed=closed).closed_right == itvl.including_right]
+        assert list(index) == expected
+    assert IntervalSet.from_pandas(groups) == iset
+
+    right = IntervalSet.from_intervals(
+        [Interval(itvl.left, itvl.right, False, True) for itvl in itvls])
+    index = right.to_pandas()
+    assert index.closed == "right"
+    assert index.left.tolist() == right.left.tolist()
+    assert IntervalSet.from_pandas(index) == right
+    with pytest.raises(ValueError):
+        iset.to_pandas()
+
+
+def test_adjoined_intervals_merged_after_copy():
+    value = Value([Interval(1, 2)])
+    assert Interval(1, 2).freeze().overlaps(Interval(2, 3))
+    assert edges((value + Interval(2, 3)).intervals) == [(1, 3, True, False)]
+    assert edges((value.copy() + Interval(2, 3)).intervals) \
+        == [(1, 3, True, False)]
+    assert edges(Interval.trim_intervals(
+        [Interval(1, 2).freeze(), Interval(2, 3)])) == [(1, 3, True, False)]
+
+
+def test_copy_shares_frozen_intervals():
+    value = Value([Interval(1, 2), Interval(5, 6)])
+    copy_ = value.copy()
+    assert all(itvl.frozen for itvl in value.intervals)
+    assert all(cp is itvl for cp, itvl in zip(copy_.intervals, value.intervals))
+    assert all(cp is itvl
+        for cp, itvl in zip(copy_.copy().intervals, value.intervals))
+
+    value.add_interval(Interval(2, 4))
+    value.__add__(Interval(6, 7), mutable=True)
+    copy_.discard_interval(Interval(1.5, 5.5))
+    assert edges(value.intervals) == [(1, 4, True, False), (5, 7, True, False)]
+    assert edges(copy_.intervals) == [(1, 1.5, True, False), (5.5, 6, True, False)]
+
+
+def test_datetime_interval_set_bytes():
+    iset = DatetimeIntervalSet(
+        pd.to_datetime(["2020-01-01", "2021-01-01"]),
+        pd.to_datetime(["2020-06-01", "2022-01-01"]),
+        [True, False],
+        [False, True]
+    )
+    assert DatetimeIntervalSet.from_bytes(iset.to_bytes()) == iset
+
+
+def test_locate_in_null_boxes():
+    boxes = BoxSet([[1, 1]], [[1, 1]])
+    assert boxes.locate([[1, 1], [0, 0]]).tolist() == [-1, -1]
+
+
+def test_parse_intervals_with_one_edge_invalid():
+    itvls = parse_intervals(["(1, 3]", "(abc, 3]", "(2, x]"], how="pandas")
+    assert itvls.isna().tolist() == [False, True, True]
+    assert itvls[0] == pd.Interval(1.0, 3.0, closed="right")
+
+
+def test_value_add_point_removes_merged_single_points():
+    value = Value([Interval(8, 8, True, True), Interval(9, 19)])
+    value.add_point(8)
+    assert value.sized == {8}
+    assert edges(value.intervals) == [(9, 19, True, False)]
+    value.add_interval(Interval(8, 9, False, False))
+    assert value.sized == set()
+    assert edges(value.intervals) == [(8, 19, True, False)]
+
+
+def test_value_updates_span_blocks(monkeypatch):
+    # Small blocks, so that updates split, merge and delete blocks
+    monkeypatch.setattr(_SortedBlocks, "load", 2)
+    rng = np.random.default_rng(11)
+    value = Value(copies(random_intervals(rng, 300, high=400)))
+    expected = IntervalSet.from_any(value)
+    for itvl in random_intervals(rng, 600, high=400):
+        points = [int(pt) for pt in rng.integers(0, 405, 3)]
+        if rng.random() < 0.5:
+            value.add_interval(itvl.copy())
+            for point in points:
+                value.add_point(point)
+            expected = expected.union([itvl, *points])
+        else:
+            value.discard_interval(itvl.copy())
+            for point in points:
+                value.discard_point(point)
+            expected = expected.difference([itvl, *points])
+        if rng.random() < 0.1:
+            assert IntervalSet.from_any(value) == expected
+    assert IntervalSet.from_any(value) == expected
+    lefts = [itvl.left for itvl in value.intervals]
+    assert lefts == sorted(lefts)
+    assert all(itvl.left < itvl.right for itvl in value.intervals)
+
+
+def test_interval_add_arrays_and_zero():
+    for other in (np.array([2., 5.]), pd.Series([2., 5.]), [2., 5.]):
+        added = Interval(0, 3) + other
+        assert added.sized == {5.} and edges(added.intervals) == [(0, 3, True, False)]
+    assert edges([Interval(0, 3) + np.array([])]) == [(0, 3, True, False)]
+    assert Interval(0, 3).overlaps(np.array([2.]))
+    assert not Interval(0, 3).overlaps(np.array([]))
+    # `0` is a point rather than nothing
+    added = Interval(1, 3) + 0
+    assert added.sized == {0} and edges(added.intervals) == [(1, 3, True, False)]
+
+
+def test_box_set_locate_without_table(monkeypatch):
+    rng = np.random.default_rng(13)
+    left = rng.integers(0, 30, (60, 3)).astype(float)
+    right = left + rng.integers(0, 8, (60, 3))
+    closed = rng.integers(0, 2, (2, 60, 3)).astype(bool)
+    points = rng.integers(-2, 40, (500, 3)).astype(float)
+    points[:5, 1] = np.nan
+    inside = (np.where(closed[0], left <= points[:, None], left < points[:, None])
+        & np.where(closed[1], points[:, None] <= right, points[:, None] < right)) \
+        .all(axis=-1)
+    expected = np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+    located = BoxSet(left, right, closed[0], closed[1]).locate(points)
+    assert (located == expected).all()
+    monkeypatch.setattr(BoxSet, "max_table_size", 0)
+    boxes = BoxSet(left, right, closed[0], closed[1])
+    assert (boxes.locate(points) == expected).all()
+    assert boxes._table[1] is None
@@ -34,6 +34,8 @@ FTYPE_LOOKUP = {
     # For string
     r"%s": [r"(\S+)", str]
 }
+# Compiled patterns registry: {(pattern, flags): compiled pattern}
+COMPILED_PATTERNS = {}
 # Re-escape `\` for `re.sub`
 RE_FTYPE_LOOKUP = {
     k: re.sub(r"\\([a-zA-z])", r"\\\\\1", v[0]) for k,v in FTYPE_LOOKUP.items()
@@ -57,6 +59,31 @@ MODIFIER_FTYPE_LOOKUP = {
 }
 
 # %%
+def compiled(
+    ptn:str,
+    flags:int = 0
+) -> re.Pattern:
+    """
+    Description:
+    Get compiled pattern from `COMPILED_PATTERNS`, and the pattern will be
+    compiled and registered only once.
+
+    Params:
+    ptn: regex pattern
+    flags: regex flags
+
+    Return:
+    compiled pattern
+    """
+    key = (ptn, flags)
+    cptn = COMPILED_PATTERNS.get(key)
+    if cptn is None:
+        cptn = COMPILED_PATTERNS[key] = re.compile(ptn, flags)
+    return cptn
+
+# Formats translated into compiled patterns for `rescanf`
+RESCANF_PATTERNS = {}
+
 def rescanf(
     fmt:str,
     s:str
@@ -66,6 +93,9 @@ def rescanf(
     Something that works just like `fscanf` in C/CPP, but no type
     conversion will applied.
 
+    P.S.
+    `fmt` will be translated into regex and compiled only once.
+
     Params:
     fmt: c-style format string
     s: input string
@@ -73,9 +103,13 @@ def rescanf(
     Return:
     tuple of string, A.K.A. no dtype convertion applied
     """
-    for k, v in RE_FTYPE_LOOKUP.items():
-        fmt = re.sub(k, v, fmt)
-    return re.match(fmt, s).groups()
+    cptn = RESCANF_PATTERNS.get(fmt)
+    if cptn is None:
+        ptn = fmt
+        for k, v in RE_FTYPE_LOOKUP.items():
+            ptn = compiled(k).sub(v, ptn)
+        cptn = RESCANF_PATTERNS[fmt] = compiled(ptn)
+    return cptn.match(s).groups()
 
 def fmt2ptn(
     fmt:str
@@ -112,7 +146,7 @@ def fmt2ptn(
                 handlers.append(match[1])
         # %<rep><modifier> => get and strip repeats first
         else:
-            repeat = re.match("\d+", ele).group()
+            repeat = compiled("\d+").match(ele).group()
             ele = ele[len(repeat):]
             modifier = ele[0]
             remained_ele = ele[1:]
@@ -125,13 +159,18 @@ def fmt2ptn(
     return res, handlers
 
 
+# Formats translated into compiled patterns and handlers for `fscanf`
+FSCANF_PATTERNS = {}
+
 def fscanf(
     fmt:str,
     s:str
 ) -> tuple:
-    res, handlers = fmt2ptn(fmt)
-    ptn = "".join(res)
-    matched = re.match(ptn, s)
+    if fmt not in FSCANF_PATTERNS:
+        res, handlers = fmt2ptn(fmt)
+        FSCANF_PATTERNS[fmt] = (compiled("".join(res)), handlers)
+    cptn, handlers = FSCANF_PATTERNS[fmt]
+    matched = cptn.match(s)
     rets = [handler(subg) for handler, subg in zip(handlers, matched.groups())]
     return rets
 